@@ -0,0 +1,56 @@
+"""Time run_agent's dedup lookups: per-article queries vs. one batch call.
+
+Seeds a temporary database with half of the candidates already stored,
+then runs both lookups over the full candidate list:
+
+    python benchmarks/bench_dedup.py [--candidates 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from news_agent.models import Article
+from news_agent.storage import Storage
+
+
+async def per_article(storage: Storage, candidates: list[Article]) -> int:
+    known = 0
+    for article in candidates:
+        if await storage.article_exists(article.id):
+            await storage.get_previous_score(article.url)
+            known += 1
+    return known
+
+
+async def batched(storage: Storage, candidates: list[Article]) -> int:
+    return len(await storage.get_known_scores(candidates))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=10_000)
+    args = parser.parse_args()
+    candidates = [
+        Article(source="rss", title=f"Story {i}", url=f"https://example.com/{i}", score=i)
+        for i in range(args.candidates)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = Storage(str(Path(tmp) / "bench.db"))
+        await storage.initialize()
+        try:
+            await storage.save_articles(candidates[::2])
+            for name, lookup in (("per-article", per_article), ("batched", batched)):
+                start = time.perf_counter()
+                known = await lookup(storage, candidates)
+                elapsed = time.perf_counter() - start
+                print(f"{name:<12} {elapsed * 1000:>9.1f} ms  ({known} known)")
+        finally:
+            await storage.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Compare the streaming feed parser with feedparser.
+
+Run against saved copies of the configured feeds (download them once with
+--save), or against synthetic full-content RSS and Atom feeds by default:
+
+    python benchmarks/bench_feed_parse.py --save feeds/ --config config.yaml
+    python benchmarks/bench_feed_parse.py feeds/*.xml [--cutoff-days 7]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+import urllib.request
+from pathlib import Path
+
+import yaml
+
+from news_agent.parsing import _parse_feed_feedparser, parse_feed
+
+
+def make_feeds(entries: int = 200) -> dict[str, bytes]:
+    body = "&lt;p&gt;Full content paragraph.&lt;/p&gt;" * 80
+    rss_items = "".join(
+        f"<item><title>Entry {i}</title><link>https://example.com/{i}</link>"
+        f"<description>{body}</description><dc:creator>Writer</dc:creator>"
+        f"<pubDate>Sat, {21 - i % 20:02d} Feb 2026 08:00:00 GMT</pubDate></item>"
+        for i in range(entries)
+    )
+    atom_entries = "".join(
+        f'<entry><title>Entry {i}</title><link href="https://example.com/{i}"/>'
+        f"<author><name>Writer</name></author><content type=\"html\">{body}</content>"
+        f"<updated>2026-02-{21 - i % 20:02d}T08:00:00Z</updated></entry>"
+        for i in range(entries)
+    )
+    return {
+        "synthetic.rss": (
+            '<?xml version="1.0" encoding="utf-8"?><rss version="2.0" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>Bench</title>'
+            f"{rss_items}</channel></rss>"
+        ).encode(),
+        "synthetic.atom": (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f'<feed xmlns="http://www.w3.org/2005/Atom"><title>Bench</title>{atom_entries}</feed>'
+        ).encode(),
+    }
+
+
+def save_feeds(config_path: Path, out: Path) -> None:
+    config = yaml.safe_load(config_path.read_text())
+    out.mkdir(parents=True, exist_ok=True)
+    for i, url in enumerate(config["sources"]["rss"]["feeds"]):
+        try:
+            req = urllib.request.Request(url, headers={"User-Agent": "NewsAgent/0.1"})
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                (out / f"{i:02d}.xml").write_bytes(resp.read())
+        except Exception as e:
+            print(f"skipped {url}: {e}")
+
+
+def measure(fn, data: bytes, rounds: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(data)
+    elapsed = (time.perf_counter() - start) / rounds
+    tracemalloc.start()
+    fn(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", type=Path)
+    parser.add_argument("--save", type=Path, help="download configured feeds here")
+    parser.add_argument("--config", type=Path, default=Path("config.yaml"))
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--cutoff-days", type=float)
+    args = parser.parse_args()
+    if args.save:
+        save_feeds(args.config, args.save)
+        return
+    feeds = {p.name: p.read_bytes() for p in args.paths} or make_feeds()
+    cutoff = time.time() - args.cutoff_days * 86400 if args.cutoff_days else None
+
+    print(f"{'feed':<16} {'KB':>6} {'feedparser ms':>14} {'streaming ms':>13} {'peak KB':>14}")
+    totals = [0.0, 0.0]
+    for name, data in feeds.items():
+        slow, slow_peak = measure(lambda d: _parse_feed_feedparser(d, "utf-8"), data, args.rounds)
+        fast, fast_peak = measure(lambda d: parse_feed(d, cutoff=cutoff), data, args.rounds)
+        totals[0] += slow
+        totals[1] += fast
+        print(
+            f"{name[:16]:<16} {len(data) / 1e3:>6.0f} {slow * 1000:>14.1f} {fast * 1000:>13.1f}"
+            f" {slow_peak / 1e3:>6.0f}/{fast_peak / 1e3:<7.0f}"
+        )
+    print(f"{'total':<16} {'':>6} {totals[0] * 1000:>14.1f} {totals[1] * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
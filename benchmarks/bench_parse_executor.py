@@ -0,0 +1,76 @@
+"""Measure event-loop blocking while parsing feeds inline vs. in a ParseExecutor.
+
+A heartbeat coroutine ticks every millisecond; any delay beyond that is time
+the loop could not service other fetches. Run with:
+
+    python benchmarks/bench_parse_executor.py [--feeds 25] [--entries 200]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from news_agent.parsing import ParseExecutor, parse_feed
+
+TICK = 0.001
+
+
+def make_feed(entries: int) -> bytes:
+    items = "".join(
+        f"<item><title>Entry {i}</title><link>https://example.com/{i}</link>"
+        f"<description>{'<p>Full content paragraph.</p>' * 80}</description>"
+        f"<pubDate>Sat, 21 Feb 2026 08:00:00 GMT</pubDate></item>"
+        for i in range(entries)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f"<title>Bench</title>{items}</channel></rss>"
+    ).encode()
+
+
+async def heartbeat(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(max(0.0, time.perf_counter() - start - TICK))
+
+
+async def measure(mode: str, feeds: list[bytes]) -> tuple[float, float, float]:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    ticker = asyncio.create_task(heartbeat(stop, lags))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    if mode == "inline":
+        for data in feeds:
+            parse_feed(data)
+            await asyncio.sleep(0)
+    else:
+        executor = ParseExecutor({"executor": mode})
+        try:
+            await asyncio.gather(*(executor.run(parse_feed, d) for d in feeds))
+        finally:
+            executor.close()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return elapsed, max(lags, default=0.0), sum(lags)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--feeds", type=int, default=25)
+    parser.add_argument("--entries", type=int, default=200)
+    args = parser.parse_args()
+    feeds = [make_feed(args.entries) for _ in range(args.feeds)]
+    size_mb = sum(len(f) for f in feeds) / 1e6
+    print(f"{args.feeds} feeds x {args.entries} entries ({size_mb:.1f} MB)")
+    print(f"{'mode':<8} {'wall (s)':>9} {'max lag (ms)':>13} {'total lag (s)':>14}")
+    for mode in ("inline", "thread", "process"):
+        elapsed, worst, total = await measure(mode, feeds)
+        print(f"{mode:<8} {elapsed:>9.2f} {worst * 1000:>13.1f} {total:>14.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""Time Storage.save_articles for a large batch.
+
+    python benchmarks/bench_storage_write.py [--articles 50000] [--synchronous NORMAL]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from news_agent.models import Article
+from news_agent.storage import Storage
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=50_000)
+    parser.add_argument("--synchronous", default="NORMAL")
+    args = parser.parse_args()
+    articles = [
+        Article(
+            source="rss",
+            title=f"Story {i}",
+            url=f"https://example.com/{i}",
+            summary="Summary text " * 20,
+            score=i,
+            tags=["bench"],
+        )
+        for i in range(args.articles)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = Storage(str(Path(tmp) / "bench.db"), {"synchronous": args.synchronous})
+        await storage.initialize()
+        try:
+            for label in ("insert", "upsert"):
+                start = time.perf_counter()
+                await storage.save_articles(articles)
+                elapsed = time.perf_counter() - start
+                print(f"{label:<7} {len(articles)} articles in {elapsed * 1000:.0f} ms")
+        finally:
+            await storage.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""Compare the restricted trending parser with a full html.parser parse.
+
+The default fixture is a synthetic trending page padded with the kind of
+navigation, scripts and footer markup the real page carries around its 25
+repo rows. Pass a saved page to measure the real thing:
+
+    curl -o trending.html https://github.com/trending
+    python benchmarks/bench_trending_parse.py [--html trending.html] [--rounds 50]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from news_agent.parsing import HTML_PARSER, parse_trending
+
+
+def make_page(rows: int = 25) -> bytes:
+    chrome = (
+        '<div class="Header"><nav>'
+        + "".join(f'<a class="HeaderMenu-link" href="/n{i}">Link {i}</a>' for i in range(200))
+        + "</nav></div>"
+        + "<script>" + "var x = 1;" * 2000 + "</script>"
+    )
+    article = (
+        '<article class="Box-row"><div class="float-right"><button>Star</button></div>'
+        '<h2 class="h3 lh-condensed"><a href="/owner{i}/repo{i}">owner{i} / repo{i}</a></h2>'
+        '<p class="col-9 color-fg-muted my-1 pr-4">Description of repo {i}</p>'
+        '<div class="f6 color-fg-muted mt-2">'
+        '<span itemprop="programmingLanguage">Python</span>'
+        '<a class="Link" href="/owner{i}/repo{i}/stargazers"><svg></svg>12,345</a>'
+        '<span>Built by ' + '<a href="/u"><img src="/a.png"></a>' * 5 + "</span>"
+        "</div></article>"
+    )
+    body = "".join(article.format(i=i) for i in range(rows))
+    footer = "<footer>" + "<li><a href='/f'>Footer</a></li>" * 300 + "</footer>"
+    return f"<html><head>{chrome}</head><body>{body}{footer}</body></html>".encode()
+
+
+def parse_full(data: bytes) -> list[str]:
+    """The previous implementation: build the whole tree with html.parser."""
+    soup = BeautifulSoup(data.decode("utf-8", errors="replace"), "html.parser")
+    return [a["href"] for a in soup.select("article.Box-row h2 a")]
+
+
+def bench(fn, data: bytes, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(data)
+    return (time.perf_counter() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--html", type=Path)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    data = args.html.read_bytes() if args.html else make_page()
+    assert len(parse_trending(data)) == len(parse_full(data))
+    full = bench(parse_full, data, args.rounds)
+    restricted = bench(parse_trending, data, args.rounds)
+    print(f"page {len(data) / 1e3:.0f} KB, {len(parse_full(data))} repos")
+    print(f"full html.parser        {full * 1000:>8.2f} ms")
+    print(f"restricted ({HTML_PARSER:<11}) {restricted * 1000:>8.2f} ms  ({full / restricted:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
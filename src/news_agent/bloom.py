@@ -0,0 +1,142 @@
+"""Memory-mapped Bloom filter over stored article ids and canonical URLs.
+
+The filter lives in a file beside the database, so answering "have we
+seen this?" costs a few page reads instead of an index probe per key, and
+Storage only queries SQLite for probable hits. A Bloom filter has no false
+negatives as long as it saw every insert; the header records the highest
+article rowid it covers so a filter older than its database is detected
+and rebuilt.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Iterable
+
+MAGIC = b"NABLOOM1"
+# magic, size in bits, hash count, capacity, keys added, covered rowid
+HEADER = struct.Struct("<8sQQQQQ")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter backed by an mmap'ed file.
+
+    Use :meth:`create` to size a new file for ``capacity`` keys at
+    ``error_rate`` and :meth:`open` to map an existing one. Bits are set in
+    the shared mapping as keys are added; :meth:`flush` persists the header
+    counters and syncs the mapping.
+    """
+
+    def __init__(self, path: str | Path, mm: mmap.mmap, fd: int):
+        self.path = Path(path)
+        self._mm = mm
+        self._fd = fd
+        if len(mm) < HEADER.size:
+            raise ValueError(f"{path} is too short for a bloom filter header")
+        magic, self.bits, self.hashes, self.capacity, self.count, self.rowid = (
+            HEADER.unpack_from(mm, 0)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a bloom filter file")
+        # A partly written or truncated file would fail lookups later on.
+        if not self.bits or not self.hashes or len(mm) != HEADER.size + self.bits // 8:
+            raise ValueError(f"{path} does not match its header ({len(mm)} bytes)")
+
+    @classmethod
+    def create(
+        cls, path: str | Path, capacity: int, error_rate: float = 0.001
+    ) -> BloomFilter:
+        capacity = max(1, int(capacity))
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        bits = (bits + 7) // 8 * 8
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, bits, hashes, capacity, 0, 0))
+            f.truncate(HEADER.size + bits // 8)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: str | Path) -> BloomFilter:
+        fd = os.open(path, os.O_RDWR)
+        try:
+            mm = mmap.mmap(fd, 0)
+        except (OSError, ValueError):
+            os.close(fd)
+            raise
+        try:
+            return cls(path, mm, fd)
+        except Exception:
+            mm.close()
+            os.close(fd)
+            raise
+
+    def _positions(self, key: str) -> list[int]:
+        # Kirsch-Mitzenmacher double hashing: two 64-bit halves of one digest.
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        mm = self._mm
+        for pos in self._positions(key):
+            offset = HEADER.size + (pos >> 3)
+            mm[offset] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        mm = self._mm
+        return all(
+            mm[HEADER.size + (pos >> 3)] & (1 << (pos & 7))
+            for pos in self._positions(key)
+        )
+
+    def fill_ratio(self) -> float:
+        ones = 0
+        chunk = 1 << 20
+        for start in range(HEADER.size, len(self._mm), chunk):
+            ones += int.from_bytes(self._mm[start : start + chunk], "little").bit_count()
+        return ones / self.bits
+
+    def report(self, probes: int = 10000) -> dict[str, Any]:
+        """Expected and measured false-positive rate.
+
+        The expected rate follows from the fraction of bits set; the
+        measured one probes ``probes`` keys that were never added.
+        """
+        fill = self.fill_ratio()
+        salt = os.urandom(8).hex()
+        hits = sum(f"bloom-probe:{salt}:{i}" in self for i in range(probes))
+        return {
+            "path": str(self.path),
+            "size_bytes": len(self._mm),
+            "bits": self.bits,
+            "hashes": self.hashes,
+            "capacity": self.capacity,
+            "count": self.count,
+            "fill_ratio": fill,
+            "expected_fpr": fill**self.hashes,
+            "measured_fpr": hits / probes if probes else 0.0,
+        }
+
+    def flush(self) -> None:
+        HEADER.pack_into(
+            self._mm, 0, MAGIC, self.bits, self.hashes, self.capacity, self.count, self.rowid
+        )
+        self._mm.flush()
+
+    def close(self) -> None:
+        if self._mm.closed:
+            return
+        self.flush()
+        self._mm.close()
+        os.close(self._fd)
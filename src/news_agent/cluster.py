@@ -0,0 +1,193 @@
+"""Near-duplicate story clustering with MinHash signatures and an LSH index.
+
+Runs between dedup and LLM filtering: copies of one event arriving under
+different URLs and titles collapse into a single representative, and
+copies of stories already stored in the last ``history_days`` are set
+aside in ``StoryClusterer.covered``.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+from news_agent.models import Article
+
+if TYPE_CHECKING:
+    from news_agent.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+# Shingle hashes and permutations stay below 2**31 so products fit in two
+# machine words, which keeps the pure-Python signature loop cheap.
+MERSENNE_PRIME = (1 << 31) - 1
+NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def shingles(text: str, k: int = 5) -> set[int]:
+    """Hashed character k-grams of normalised text (works for CJK titles too).
+
+    Uses the built-in str hash, which is salted per process: signatures are
+    only ever compared within one run, never stored.
+    """
+    text = NON_WORD.sub(" ", text.lower()).strip()
+    if len(text) <= k:
+        return {hash(text) & MERSENNE_PRIME} if text else set()
+    return {hash(text[i : i + k]) & MERSENNE_PRIME for i in range(len(text) - k + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 32, seed: int = 1):
+        rng = random.Random(seed)
+        self.perms = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, features: set[int]) -> tuple[int, ...]:
+        if not features:
+            return ()
+        return tuple(
+            [min([(a * h + b) % MERSENNE_PRIME for h in features]) for a, b in self.perms]
+        )
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class LshIndex:
+    """Banded LSH: signatures sharing any band are candidate duplicates."""
+
+    def __init__(self, bands: int, rows: int):
+        self.bands = bands
+        self.rows = rows
+        self._buckets: list[dict[tuple[int, ...], list[int]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+
+    def _bands(self, signature: tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows : (band + 1) * self.rows]
+
+    def add(self, key: int, signature: tuple[int, ...]) -> None:
+        for band, chunk in self._bands(signature):
+            self._buckets[band][chunk].append(key)
+
+    def query(self, signature: tuple[int, ...]) -> set[int]:
+        found: set[int] = set()
+        for band, chunk in self._bands(signature):
+            found.update(self._buckets[band].get(chunk, ()))
+        return found
+
+
+class StoryClusterer:
+    """Collapses near-duplicate articles before they are scored.
+
+    With the defaults (32 permutations in 8 bands of 4 rows) pairs above
+    about 0.6 Jaccard similarity usually become candidates; they are merged
+    when the signature estimate reaches ``threshold``.
+
+    After :meth:`cluster`, ``covered`` holds the articles dropped as copies
+    of stored stories, duplicates included, so the caller can store them
+    unrecommended and later runs dedup them by URL.
+    """
+
+    def __init__(self, config: dict[str, Any] | None = None, storage: Storage | None = None):
+        self.config = config or {}
+        self.storage = storage
+        self.threshold = self.config.get("threshold", 0.6)
+        self.bands = self.config.get("bands", 8)
+        self.rows = self.config.get("rows", 4)
+        self.shingle_size = self.config.get("shingle_size", 5)
+        self.summary_chars = self.config.get("summary_chars", 100)
+        self.history_days = self.config.get("history_days", 3)
+        self.hasher = MinHasher(self.bands * self.rows)
+        self.covered: list[Article] = []
+
+    def signature(self, article: Article) -> tuple[int, ...]:
+        text = f"{article.title} {article.summary[: self.summary_chars]}"
+        return self.hasher.signature(shingles(text, self.shingle_size))
+
+    async def cluster(self, articles: list[Article]) -> list[Article]:
+        self.covered = []
+        if not articles:
+            return articles
+        signatures = [self.signature(a) for a in articles]
+        index = LshIndex(self.bands, self.rows)
+        for i, sig in enumerate(signatures):
+            if sig:
+                index.add(i, sig)
+
+        parent = list(range(len(articles)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, sig in enumerate(signatures):
+            for j in index.query(sig) if sig else ():
+                if j > i and similarity(sig, signatures[j]) >= self.threshold:
+                    parent[find(j)] = find(i)
+
+        clusters: dict[int, list[Article]] = defaultdict(list)
+        for i, article in enumerate(articles):
+            clusters[find(i)].append(article)
+        merged = [self._merge(group) for group in clusters.values()]
+        fresh = await self._drop_seen_stories(merged)
+        logger.info(
+            f"Clustering: {len(articles)} articles -> {len(merged)} stories, "
+            f"{len(merged) - len(fresh)} already covered in the last {self.history_days} days"
+        )
+        return fresh
+
+    @staticmethod
+    def _merge(group: list[Article]) -> Article:
+        """The best-scored copy, with the others attached as ``duplicates``.
+
+        The representative keeps its own score and comment count, which are
+        what get stored; cluster totals are ``total_score`` and
+        ``total_comments``.
+        """
+        if len(group) == 1:
+            return group[0]
+        rep = max(group, key=lambda a: (a.score, a.comments_count, len(a.summary)))
+        rep.duplicates = [a for a in group if a is not rep]
+        rep.tags = list(dict.fromkeys(t for a in group for t in a.tags))
+        logger.debug(f"Merged {len(group)} copies of {rep.title!r}")
+        return rep
+
+    async def _drop_seen_stories(self, articles: list[Article]) -> list[Article]:
+        if self.storage is None or not self.history_days:
+            return articles
+        since = datetime.now(timezone.utc) - timedelta(days=self.history_days)
+        history = await self.storage.get_recent_articles(since)
+        index = LshIndex(self.bands, self.rows)
+        stored: list[tuple[str, tuple[int, ...]]] = []
+        for past in history:
+            sig = self.signature(past)
+            if sig:
+                index.add(len(stored), sig)
+                stored.append((past.canonical_url, sig))
+        fresh = []
+        for article in articles:
+            sig = self.signature(article)
+            # An article's own stored row (a resurfaced score jump) never counts.
+            seen = sig and any(
+                stored[j][0] != article.canonical_url
+                and similarity(sig, stored[j][1]) >= self.threshold
+                for j in index.query(sig)
+            )
+            if seen:
+                self.covered += [article, *article.duplicates]
+            else:
+                fresh.append(article)
+        return fresh
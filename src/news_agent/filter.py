@@ -52,7 +52,7 @@ class LLMFilter:
     async def _score_batch(self, articles: list[Article]) -> list[Article]:
         articles_text = "\n\n".join(
             f"[{i}] 来源: {a.source} | 标题: {a.title} | "
-            f"摘要: {a.summary} | 热度: {a.score} | 评论数: {a.comments_count}"
+            f"摘要: {a.summary} | 热度: {a.total_score} | 评论数: {a.total_comments}"
             for i, a in enumerate(articles)
         )
 
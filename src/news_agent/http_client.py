@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+import aiohttp
+from yarl import URL
+
+from news_agent.latency import LatencyTracker
+from news_agent.scheduler import RequestScheduler
+
+if TYPE_CHECKING:
+    from news_agent.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK = 64 * 1024
+
+# ETag, Last-Modified and body hash of a response.
+Validator = tuple[str | None, str | None, str | None]
+
+
+class BodyTooLarge(aiohttp.ClientError):
+    """A response exceeded its byte cap and the cap is set to abort."""
+
+
+def _charset(resp: aiohttp.ClientResponse) -> str | None:
+    """The charset declared in Content-Type, known before the body is read.
+
+    None when there is none (or it is unknown): the document may declare its
+    own, which only a parser given the raw bytes can see.
+    """
+    if not resp.charset:
+        return None
+    try:
+        return codecs.lookup(resp.charset).name
+    except LookupError:
+        return None
+
+
+def _accept_encoding() -> str:
+    """Advertise brotli only when aiohttp can actually decode it."""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return "gzip, deflate"
+    return "gzip, deflate, br"
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    @property
+    def handshakes_saved(self) -> int:
+        return self.reused_connections
+
+
+@dataclass
+class ReadStats:
+    """Response bytes read for one source.
+
+    ``peak`` is the most body bytes the source held buffered at once
+    across its concurrent reads.
+    """
+
+    bytes: int = 0
+    bodies: int = 0
+    truncated: int = 0
+    aborted: int = 0
+    in_flight: int = 0
+    peak: int = 0
+
+
+@dataclass
+class Body:
+    data: bytes
+    # From the Content-Type header; None leaves detection to the parser.
+    encoding: str | None = None
+    # Set by get_if_changed; the caller stages it once the body is handled.
+    validator: Validator | None = None
+
+
+class _ScheduledRequest:
+    """Async context manager mirroring ``session.get(...)``.
+
+    Holds the host's politeness slot until the response is released.
+    """
+
+    def __init__(self, client: HttpClient, method: str, url: str, kwargs: dict):
+        self._client = client
+        self._method = method
+        self._url = url
+        self._kwargs = kwargs
+        self._semaphore = client.scheduler.semaphore(URL(url).host or "")
+        self._resp: aiohttp.ClientResponse | None = None
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        await self._semaphore.acquire()
+        try:
+            self._resp = await self._client.scheduler.send(
+                self._client.session, self._method, self._url, **self._kwargs
+            )
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self._resp
+
+    async def __aexit__(self, *exc_info) -> None:
+        try:
+            self._resp.release()
+        finally:
+            self._semaphore.release()
+
+
+class HttpClient:
+    """Run-scoped HTTP client shared by every source.
+
+    Wraps a single ``aiohttp.ClientSession`` with a tuned connector so sources
+    hitting the same host reuse keep-alive connections and cached DNS answers.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        storage: Storage | None = None,
+    ):
+        self.config = config or {}
+        self.storage = storage
+        self.limit = self.config.get("limit", 100)
+        self.limit_per_host = self.config.get("limit_per_host", 8)
+        self.keepalive_timeout = self.config.get("keepalive_timeout", 30)
+        self.dns_cache_ttl = self.config.get("dns_cache_ttl", 300)
+        self.user_agent = self.config.get("user_agent", "NewsAgent/0.1")
+        self.max_body_bytes = self.config.get("max_body_bytes", 10 * 1024 * 1024)
+        self.oversize = self.config.get("oversize", "truncate")
+        self.latency = LatencyTracker(self.config)
+        self.scheduler = RequestScheduler(self.config, self.latency)
+        self.host_stats: dict[str, HostStats] = defaultdict(HostStats)
+        self.read_stats: dict[str, ReadStats] = defaultdict(ReadStats)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._validators: dict[str, Validator] = {}
+        self._session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> HttpClient:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers={
+                "Accept-Encoding": _accept_encoding(),
+                "User-Agent": self.user_agent,
+            },
+            trace_configs=[self._trace_config()],
+        )
+        if self.storage is not None:
+            await self.scheduler.load(self.storage)
+            await self.latency.load(self.storage)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            if self.storage is not None:
+                await self.scheduler.save(self.storage)
+                await self.latency.save(self.storage)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            raise RuntimeError("HttpClient is not started")
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs) -> _ScheduledRequest:
+        return _ScheduledRequest(self, method, url, kwargs)
+
+    def get(self, url: str, **kwargs) -> _ScheduledRequest:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _ScheduledRequest:
+        return self.request("POST", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> _ScheduledRequest:
+        return self.request("HEAD", url, **kwargs)
+
+    async def _iter_body(
+        self,
+        resp: aiohttp.ClientResponse,
+        source: str,
+        max_bytes: int | None,
+        oversize: str | None,
+    ) -> AsyncIterator[bytes]:
+        """Yield the body in chunks, stopping at ``max_bytes``.
+
+        Past the cap the body is cut short (``oversize: truncate``) or
+        BodyTooLarge is raised (``abort``); either way the rest is never read.
+        """
+        cap = max_bytes or self.max_body_bytes
+        mode = oversize or self.oversize
+        stats = self.read_stats[source or URL(str(resp.url)).host or ""]
+        stats.bodies += 1
+        if mode == "abort" and (resp.content_length or 0) > cap:
+            stats.aborted += 1
+            raise BodyTooLarge(f"{resp.url}: {resp.content_length} bytes > {cap}")
+        held = 0
+        try:
+            async for chunk in resp.content.iter_chunked(READ_CHUNK):
+                if held + len(chunk) > cap:
+                    if mode == "abort":
+                        stats.aborted += 1
+                        raise BodyTooLarge(f"{resp.url}: more than {cap} bytes")
+                    chunk = chunk[: cap - held]
+                    stats.truncated += 1
+                    logger.warning(f"Truncated {resp.url} at {cap} bytes")
+                held += len(chunk)
+                stats.bytes += len(chunk)
+                stats.in_flight += len(chunk)
+                stats.peak = max(stats.peak, stats.in_flight)
+                yield chunk
+                if held >= cap:
+                    break
+        finally:
+            stats.in_flight -= held
+
+    async def read_body(
+        self,
+        resp: aiohttp.ClientResponse,
+        *,
+        source: str = "",
+        max_bytes: int | None = None,
+        oversize: str | None = None,
+    ) -> Body:
+        chunks = [c async for c in self._iter_body(resp, source, max_bytes, oversize)]
+        return Body(b"".join(chunks), _charset(resp))
+
+    async def read_text(
+        self,
+        resp: aiohttp.ClientResponse,
+        *,
+        source: str = "",
+        max_bytes: int | None = None,
+        oversize: str | None = None,
+    ) -> str:
+        """Decode the body chunk by chunk as it arrives."""
+        decoder = codecs.getincrementaldecoder(_charset(resp) or "utf-8")(
+            errors="replace"
+        )
+        parts = [
+            decoder.decode(chunk)
+            async for chunk in self._iter_body(resp, source, max_bytes, oversize)
+        ]
+        parts.append(decoder.decode(b"", final=True))
+        return "".join(parts)
+
+    async def read_json(
+        self,
+        resp: aiohttp.ClientResponse,
+        *,
+        source: str = "",
+        max_bytes: int | None = None,
+    ) -> Any:
+        # A truncated document is never valid JSON, so oversize always aborts.
+        return json.loads(
+            await self.read_text(
+                resp, source=source, max_bytes=max_bytes, oversize="abort"
+            )
+        )
+
+    async def get_if_changed(
+        self,
+        url: str,
+        *,
+        source: str = "",
+        max_bytes: int | None = None,
+        oversize: str | None = None,
+        **kwargs,
+    ) -> Body | None:
+        """Conditional GET using the validators stored for ``url``.
+
+        Returns None when the server answers 304 or the body hash matches the
+        previous run, so callers can skip parsing entirely. A changed body
+        carries its new validator, which is not recorded here: the caller
+        passes it to :meth:`stage_validator` once the body has been handled.
+        """
+        cached = self._validators.get(url)
+        if cached is None and self.storage is not None:
+            cached = await self.storage.get_validator(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        async with self.get(url, headers=headers, **kwargs) as resp:
+            if resp.status == 304:
+                self.cache_hits += 1
+                return None
+            resp.raise_for_status()
+            body = await self.read_body(
+                resp, source=source, max_bytes=max_bytes, oversize=oversize
+            )
+            data = body.data
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+        validator = (etag, last_modified, hashlib.sha256(data).hexdigest())
+        if cached and cached[2] == validator[2]:
+            # Same content as a body already handled; only headers may differ.
+            self._validators[url] = validator
+            self.cache_hits += 1
+            return None
+        self.cache_misses += 1
+        body.validator = validator
+        return body
+
+    def stage_validator(self, url: str, validator: Validator | None) -> None:
+        """Queue ``url``'s validator for the next :meth:`commit_validators`."""
+        if validator is not None:
+            self._validators[url] = validator
+
+    async def commit_validators(self) -> None:
+        """Persist validators seen this run.
+
+        Called only once the run's articles are saved, so a crash mid-run
+        does not mark unprocessed feed content as already seen.
+        """
+        if self.storage is not None and self._validators:
+            await self.storage.save_validators(self._validators)
+        self._validators = {}
+
+    def stats(self) -> dict[str, HostStats]:
+        return dict(self.host_stats)
+
+    def log_stats(self) -> None:
+        if self.cache_hits or self.cache_misses:
+            logger.info(
+                f"HTTP cache: {self.cache_hits} hits, {self.cache_misses} misses"
+            )
+        for source, r in sorted(self.read_stats.items()):
+            logger.info(
+                f"  [{source}] read {r.bytes / 1024:.0f} KB in {r.bodies} bodies, "
+                f"peak {r.peak / 1024:.0f} KB buffered, "
+                f"{r.truncated} truncated, {r.aborted} aborted"
+            )
+        if not self.host_stats:
+            return
+        total_requests = sum(s.requests for s in self.host_stats.values())
+        total_new = sum(s.new_connections for s in self.host_stats.values())
+        total_reused = sum(s.reused_connections for s in self.host_stats.values())
+        logger.info(
+            f"HTTP: {total_requests} requests over {len(self.host_stats)} hosts, "
+            f"{total_new} new connections, {total_reused} reused"
+        )
+        for host, s in sorted(self.host_stats.items()):
+            logger.debug(
+                f"  {host}: {s.requests} requests, {s.new_connections} new, "
+                f"{s.reused_connections} reused, dns hits={s.dns_cache_hits}"
+            )
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        # trace_config_ctx is shared by all signals of one request, so the host
+        # recorded on request start attributes the later connection events.
+        trace = aiohttp.TraceConfig(trace_config_ctx_factory=self._trace_ctx)
+
+        async def on_request_start(session, ctx, params):
+            ctx.host = params.url.host or ""
+            self.host_stats[ctx.host].requests += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.host_stats[ctx.host].new_connections += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.host_stats[ctx.host].reused_connections += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.host_stats[params.host].dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.host_stats[params.host].dns_cache_misses += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    @staticmethod
+    def _trace_ctx(trace_request_ctx=None) -> SimpleNamespace:
+        return SimpleNamespace(host="", trace_request_ctx=trace_request_ctx)
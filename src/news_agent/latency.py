@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from news_agent.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile, ``q`` in [0, 1]."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LatencyTracker:
+    """Latency histories per source and per host, persisted across runs.
+
+    Keys are ``source:<name>`` and ``host:<hostname>``. Timeouts are the
+    configured percentile of a key's history times ``timeout_multiplier``,
+    clamped to [min_timeout, max_timeout]; keys with too little history fall
+    back to the caller's default.
+    """
+
+    def __init__(self, config: dict[str, Any] | None = None):
+        self.config = config or {}
+        self.percentile = self.config.get("timeout_percentile", 0.95)
+        self.multiplier = self.config.get("timeout_multiplier", 2.0)
+        self.min_timeout = self.config.get("min_timeout", 5.0)
+        self.max_timeout = self.config.get("max_timeout", 300.0)
+        self.min_samples = self.config.get("min_samples", 5)
+        self.history_size = self.config.get("history_size", 50)
+        self.hedge_percentile = self.config.get("hedge_percentile", 0.95)
+        self.history: dict[str, list[float]] = defaultdict(list)
+        self._pending: list[tuple[str, float]] = []
+
+    async def load(self, storage: Storage) -> None:
+        self.history = defaultdict(list, await storage.get_latency_samples(self.history_size))
+
+    async def save(self, storage: Storage) -> None:
+        if self._pending:
+            await storage.record_latencies(self._pending, self.history_size)
+            self._pending = []
+
+    def record(self, key: str, latency: float) -> None:
+        self._pending.append((key, latency))
+
+    def timeout_for(self, key: str, default: float | None) -> float | None:
+        samples = self.history.get(key, [])
+        if len(samples) < self.min_samples:
+            return default
+        derived = percentile(samples, self.percentile) * self.multiplier
+        return min(self.max_timeout, max(self.min_timeout, derived))
+
+    def hedge_delay(self, key: str) -> float | None:
+        """Seconds after which a duplicate request should be sent, if any."""
+        samples = self.history.get(key, [])
+        if len(samples) < self.min_samples:
+            return None
+        return percentile(samples, self.hedge_percentile)
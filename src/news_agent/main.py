@@ -3,14 +3,19 @@ import asyncio
 import logging
 import os
 import sys
+import time
 from pathlib import Path
 from typing import Any
 import yaml
+from news_agent.cluster import StoryClusterer
 from news_agent.filter import LLMFilter
+from news_agent.http_client import HttpClient
 from news_agent.models import Article
 from news_agent.notifier.email import EmailNotifier
 from news_agent.notifier.file import FileNotifier
 from news_agent.notifier.telegram import TelegramNotifier
+from news_agent.parsing import ParseExecutor
+from news_agent.redirects import RedirectResolver
 from news_agent.storage import Storage
 
 logger = logging.getLogger(__name__)
@@ -23,7 +28,12 @@ def load_config(path: str = "config.yaml") -> dict[str, Any]:
     with open(config_path) as f:
         return yaml.safe_load(f)
 
-def create_sources(config: dict[str, Any]) -> list:
+def create_sources(
+    config: dict[str, Any],
+    http: HttpClient | None = None,
+    executor: ParseExecutor | None = None,
+    storage: Storage | None = None,
+) -> list:
     from news_agent.sources.hackernews import HackerNewsSource
     from news_agent.sources.reddit import RedditSource
     from news_agent.sources.v2ex import V2exSource
@@ -33,19 +43,49 @@ def create_sources(config: dict[str, Any]) -> list:
     from news_agent.sources.twitter import XSource
     from news_agent.sources.ai_blogs import AiBlogsSource
     from news_agent.sources.arxiv_papers import ArxivPapersSource
+    from news_agent.sources.scrape import ScrapeSource
     source_map = {
         "hackernews": HackerNewsSource, "reddit": RedditSource, "v2ex": V2exSource,
         "github": GitHubTrendingSource, "rss": RssSource, "wired": WiredSource, "x_com": XSource,
-        "ai_blogs": AiBlogsSource, "arxiv_papers": ArxivPapersSource,
+        "ai_blogs": AiBlogsSource, "arxiv_papers": ArxivPapersSource, "scrape": ScrapeSource,
     }
     sources = []
     source_configs = config.get("sources", {})
     for name, cls in source_map.items():
         src_cfg = source_configs.get(name, {})
         if src_cfg.get("enabled", True):
-            sources.append(cls(src_cfg))
+            sources.append(cls(src_cfg, http=http, executor=executor, storage=storage))
     return sources
 
+async def _drain(source, sink: list[Article]) -> None:
+    async for batch in source.stream():
+        sink.extend(batch)
+
+async def fetch_all(sources: list, deadline: float | None = None) -> list[Article]:
+    """Consume every source's stream concurrently.
+
+    Each source enforces its own timeout; ``deadline`` additionally caps the
+    whole fetch phase. Batches already yielded are kept either way.
+    """
+    sinks: list[list[Article]] = [[] for _ in sources]
+    tasks = [asyncio.create_task(_drain(s, sink)) for s, sink in zip(sources, sinks)]
+    if not tasks:
+        return []
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    all_articles: list[Article] = []
+    for source, sink, task in zip(sources, sinks, tasks):
+        if task in pending:
+            logger.warning(f"  [{source.name}] hit fetch deadline, kept {len(sink)} articles")
+        elif task.exception() is not None:
+            logger.error(f"  [{source.name}] failed: {task.exception()}")
+        else:
+            logger.info(f"  [{source.name}] fetched {len(sink)} articles")
+        all_articles.extend(sink)
+    return all_articles
+
 def _set_api_keys(config: dict[str, Any]) -> None:
     """Set LLM API keys from config if not already in environment."""
     key_map = {"gemini": "GEMINI_API_KEY", "deepseek": "DEEPSEEK_API_KEY", "github_models": "OPENAI_API_KEY"}
@@ -58,36 +98,59 @@ async def run_agent(config_path: str = "config.yaml") -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
     config = load_config(config_path)
     _set_api_keys(config)
-    storage = Storage()
+    storage_cfg = config.get("storage", {})
+    storage = Storage(storage_cfg.get("path", "data/news.db"), storage_cfg)
     await storage.initialize()
+    http = HttpClient(config.get("http", {}), storage=storage)
+    executor = ParseExecutor(config.get("parsing", {}))
     try:
-        sources = create_sources(config)
+        await http.start()
+        sources = create_sources(config, http=http, executor=executor, storage=storage)
         logger.info(f"Fetching from {len(sources)} sources...")
-        fetch_tasks = [source.fetch() for source in sources]
-        results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
-        all_articles: list[Article] = []
-        for i, result in enumerate(results):
-            if isinstance(result, list):
-                logger.info(f"  [{sources[i].name}] fetched {len(result)} articles")
-                all_articles.extend(result)
-            else:
-                logger.error(f"  [{sources[i].name}] failed: {result}")
+        all_articles = await fetch_all(sources, config.get("fetch_deadline"))
+        http.log_stats()
         logger.info(f"Total fetched: {len(all_articles)} articles")
-        unique_articles = []
+        redirect_cfg = config.get("redirects", {})
+        if redirect_cfg.get("enabled"):
+            resolver = RedirectResolver(redirect_cfg, http=http, storage=storage)
+            await resolver.resolve_articles(all_articles)
+        # Identity is the canonical URL, so the same link from HN, Reddit and
+        # a feed is scored once.
+        candidates: list[Article] = []
         seen_urls: set[str] = set()
         for article in all_articles:
-            if article.url in seen_urls:
+            if article.canonical_url in seen_urls:
                 continue
-            seen_urls.add(article.url)
-            exists = await storage.article_exists(article.id)
-            if exists:
-                prev_score = await storage.get_previous_score(article.url)
+            seen_urls.add(article.canonical_url)
+            candidates.append(article)
+        dedup_start = time.perf_counter()
+        known_scores = await storage.get_known_scores(candidates)
+        unique_articles = []
+        for article in candidates:
+            if article.canonical_url in known_scores:
+                prev_score = known_scores[article.canonical_url]
                 if prev_score and article.score >= prev_score * 3:
                     unique_articles.append(article)
                 continue
             unique_articles.append(article)
+        logger.info(
+            f"Dedup lookup: {len(candidates)} candidates, {len(known_scores)} known, "
+            f"{(time.perf_counter() - dedup_start) * 1000:.0f} ms"
+        )
         logger.info(f"After dedup: {len(unique_articles)} articles")
+        # Copies of stored stories are stored unrecommended so later runs
+        # dedup them by URL even after the original leaves the history window.
+        covered: list[Article] = []
+        cluster_cfg = config.get("cluster", {})
+        if cluster_cfg.get("enabled"):
+            clusterer = StoryClusterer(cluster_cfg, storage=storage)
+            unique_articles = await clusterer.cluster(unique_articles)
+            covered = clusterer.covered
         if not unique_articles:
+            if covered:
+                await storage.save_articles(covered)
+            await http.commit_validators()
+            await storage.commit_staged_state()
             logger.info("No new articles to process.")
             return
         # Separate special sources from regular articles
@@ -115,7 +178,11 @@ async def run_agent(config_path: str = "config.yaml") -> None:
             llm_filter = LLMFilter(config={**config.get("llm", {}), "interests": config.get("interests", [])})
             scored_articles.extend(await llm_filter.filter_articles(other_articles))
 
-        await storage.save_articles(scored_articles)
+        # Collapsed copies are stored unrecommended so later runs dedup them.
+        collapsed = [d for a in unique_articles for d in a.duplicates]
+        await storage.save_articles(scored_articles + collapsed + covered)
+        await http.commit_validators()
+        await storage.commit_staged_state()
 
         # Split recommended news and papers for notification
         recommended_news = [a for a in scored_articles if a.is_recommended and a.source != "arxiv_papers"]
@@ -152,13 +219,43 @@ async def run_agent(config_path: str = "config.yaml") -> None:
             await storage.mark_sent(all_sent)
             logger.info("Notifications sent (check logs for errors).")
     finally:
+        executor.close()
+        await http.close()
         await storage.close()
 
+async def rebuild_bloom(config_path: str = "config.yaml") -> None:
+    """Rebuild the seen-article Bloom filter and print its false-positive report."""
+    config = load_config(config_path) if Path(config_path).exists() else {}
+    storage_cfg = config.get("storage", {})
+    storage = Storage(storage_cfg.get("path", "data/news.db"), storage_cfg)
+    await storage.initialize()
+    try:
+        start = time.perf_counter()
+        bloom = await storage.rebuild_bloom()
+        elapsed = time.perf_counter() - start
+        report = bloom.report()
+    finally:
+        await storage.close()
+    print(f"Rebuilt {report['path']} in {elapsed:.1f}s")
+    for key, value in report.items():
+        if key != "path":
+            print(f"  {key}: {value:.6g}" if isinstance(value, float) else f"  {key}: {value}")
+
 def cli_main() -> None:
     if len(sys.argv) > 1 and sys.argv[1] == "login-x":
         from news_agent.sources.twitter import XSource
         source = XSource()
         asyncio.run(source.save_session())
+    elif len(sys.argv) > 1 and sys.argv[1] == "x-browser":
+        from news_agent.sources.twitter import XSource
+        config = load_config(sys.argv[2]) if len(sys.argv) > 2 else {}
+        source = XSource(config.get("sources", {}).get("x_com", {}))
+        try:
+            asyncio.run(source.serve_browser())
+        except KeyboardInterrupt:
+            pass
+    elif len(sys.argv) > 1 and sys.argv[1] == "rebuild-bloom":
+        asyncio.run(rebuild_bloom(sys.argv[2] if len(sys.argv) > 2 else "config.yaml"))
     else:
         config_path = sys.argv[1] if len(sys.argv) > 1 else "config.yaml"
         asyncio.run(run_agent(config_path))
@@ -4,6 +4,8 @@ import hashlib
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
+from news_agent.urls import canonicalize
+
 
 @dataclass
 class Article:
@@ -22,8 +24,36 @@ class Article:
     is_recommended: bool = False
     is_hot: bool = False
     sent: bool = False
+    # Near-duplicate copies collapsed into this one by StoryClusterer; not
+    # a stored column, the copies are saved as rows of their own.
+    duplicates: list[Article] = field(default_factory=list, repr=False)
+    # (url, canonical form) memo for canonical_url; stale once url changes.
+    _canonical: tuple[str, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def id(self) -> str:
         """Unique identifier based on source and URL."""
         return hashlib.sha256(f"{self.source}:{self.url}".encode()).hexdigest()[:16]
+
+    @property
+    def total_score(self) -> int:
+        """Score summed over this article and its collapsed duplicates."""
+        return self.score + sum(d.score for d in self.duplicates)
+
+    @property
+    def total_comments(self) -> int:
+        return self.comments_count + sum(d.comments_count for d in self.duplicates)
+
+    @property
+    def canonical_url(self) -> str:
+        """The URL used for identity across sources; see urls.canonicalize.
+
+        Computed once per URL: reassigning ``url`` (as RedirectResolver
+        does) recomputes it on the next access.
+        """
+        cached = self._canonical
+        if cached is None or cached[0] != self.url:
+            cached = self._canonical = (self.url, canonicalize(self.url))
+        return cached[1]
@@ -0,0 +1,334 @@
+"""CPU-bound parsers and the executor that keeps them off the event loop.
+
+Parser functions are module-level and exchange only bytes and plain tuples,
+so they can run in a process pool without pickling Article objects.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Collection, TypeVar
+from urllib.parse import urljoin
+
+import feedparser
+from bs4 import BeautifulSoup, SoupStrainer
+
+T = TypeVar("T")
+
+# (title, link, summary, author, published timestamp or None)
+FeedEntry = tuple[str, str, str, str, float | None]
+# (repo path, description, stars, language)
+TrendingRepo = tuple[str, str, int, str]
+# (title, absolute link, score, date text)
+ListingItem = tuple[str, str, int, str]
+
+
+def _html_parser() -> str:
+    """Prefer the C-backed lxml parser when it is installed."""
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    return "lxml"
+
+
+HTML_PARSER = _html_parser()
+# Only the repo rows are turned into a tree; the rest of the page is skipped.
+TRENDING_ROWS = SoupStrainer("article", class_="Box-row")
+
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+FEED_CHUNK = 64 * 1024
+# Consecutive already-seen or too-old entries after which parsing stops; a
+# single pinned or re-promoted entry must not hide the new ones below it.
+STOP_AFTER_KNOWN = 5
+
+
+class _NotFastPath(Exception):
+    """The document is not plain RSS 2.0 or Atom; use feedparser instead."""
+
+
+def parse_feed(
+    data: bytes,
+    encoding: str | None = None,
+    cutoff: float | None = None,
+    seen: Collection[str] = (),
+) -> list[FeedEntry]:
+    """Parse RSS 2.0 / Atom, streaming, with a feedparser fallback.
+
+    Well-formed feeds go through an incremental XML parser that keeps only
+    the fields in FeedEntry. Entries published before ``cutoff`` or whose
+    link is in ``seen`` are skipped, and parsing stops after
+    STOP_AFTER_KNOWN of them in a row (feeds list newest first). Anything
+    else is handed to feedparser and filtered the same way.
+    Entries without a usable link are dropped.
+    """
+    try:
+        return _parse_feed_streaming(data, cutoff, seen)
+    except (ET.ParseError, _NotFastPath):
+        pass
+    entries = []
+    known = 0
+    for entry in _parse_feed_feedparser(data, encoding):
+        if not entry[1]:
+            continue
+        if _is_old(entry, cutoff, seen):
+            known += 1
+            if known >= STOP_AFTER_KNOWN:
+                break
+            continue
+        known = 0
+        entries.append(entry)
+    return entries
+
+
+def _is_old(entry: FeedEntry, cutoff: float | None, seen: Collection[str]) -> bool:
+    if entry[1] in seen:
+        return True
+    return cutoff is not None and entry[4] is not None and entry[4] < cutoff
+
+
+def _parse_feed_streaming(
+    data: bytes, cutoff: float | None, seen: Collection[str]
+) -> list[FeedEntry]:
+    parser = ET.XMLPullParser(events=("start", "end"))
+    entries: list[FeedEntry] = []
+    known = 0
+    root = None
+    has_channel = False
+    for offset in range(0, len(data), FEED_CHUNK):
+        parser.feed(data[offset : offset + FEED_CHUNK])
+        for event, el in parser.read_events():
+            if root is None:
+                root = el.tag
+                if root not in ("rss", f"{ATOM}feed"):
+                    raise _NotFastPath(root)
+            if event == "start":
+                has_channel = has_channel or el.tag == "channel"
+                continue
+            if el.tag == "item":
+                entry = _rss_entry(el)
+            elif el.tag == f"{ATOM}entry":
+                entry = _atom_entry(el)
+            else:
+                continue
+            el.clear()
+            if not entry[1]:
+                continue
+            if _is_old(entry, cutoff, seen):
+                known += 1
+                if known >= STOP_AFTER_KNOWN:
+                    return entries
+                continue
+            known = 0
+            entries.append(entry)
+    parser.close()
+    if root == "rss" and not has_channel:
+        raise _NotFastPath("rss without channel")
+    return entries
+
+
+def _text(el: ET.Element, tag: str) -> str:
+    # itertext also covers Atom type="xhtml", whose text sits in child elements.
+    found = el.find(tag)
+    return "".join(found.itertext()).strip() if found is not None else ""
+
+
+def _rss_link(item: ET.Element) -> str:
+    link = _text(item, "link")
+    if link:
+        return link
+    # A guid is a permalink unless marked otherwise (RSS 2.0 spec).
+    guid = item.find("guid")
+    if guid is not None and guid.get("isPermaLink", "true").lower() != "false":
+        value = (guid.text or "").strip()
+        if value.startswith(("http://", "https://")):
+            return value
+    return ""
+
+
+def _atom_link(entry: ET.Element) -> str:
+    links = [el for el in entry.findall(f"{ATOM}link") if el.get("href")]
+    for link_el in links:
+        if link_el.get("rel", "alternate") == "alternate":
+            return link_el.get("href")
+    return links[0].get("href") if links else ""
+
+
+def _rss_entry(item: ET.Element) -> FeedEntry:
+    summary = _text(item, "description") or _text(item, CONTENT_ENCODED)
+    published = None
+    pub_date = _text(item, "pubDate")
+    if pub_date:
+        try:
+            published = _timestamp(parsedate_to_datetime(pub_date))
+        except (TypeError, ValueError):
+            pass
+    return (
+        _text(item, "title"),
+        _rss_link(item),
+        summary[:500],
+        _text(item, "author") or _text(item, DC_CREATOR),
+        published,
+    )
+
+
+def _atom_entry(entry: ET.Element) -> FeedEntry:
+    summary = _text(entry, f"{ATOM}summary") or _text(entry, f"{ATOM}content")
+    published = None
+    date = _text(entry, f"{ATOM}published") or _text(entry, f"{ATOM}updated")
+    if date:
+        try:
+            published = _timestamp(datetime.fromisoformat(date))
+        except ValueError:
+            pass
+    return (
+        _text(entry, f"{ATOM}title"),
+        _atom_link(entry),
+        summary[:500],
+        _text(entry, f"{ATOM}author/{ATOM}name"),
+        published,
+    )
+
+
+def _timestamp(dt: datetime) -> float:
+    # Same convention as feedparser's published_parsed (a UTC struct_time)
+    # passed through time.mktime, so both paths agree.
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return time.mktime(dt.utctimetuple())
+
+
+def _parse_feed_feedparser(data: bytes, encoding: str | None) -> list[FeedEntry]:
+    # Without an HTTP charset, feedparser sniffs the XML declaration itself.
+    feed = feedparser.parse(data.decode(encoding, errors="replace") if encoding else data)
+    entries = []
+    for entry in feed.entries:
+        published = None
+        if hasattr(entry, "published_parsed") and entry.published_parsed:
+            published = time.mktime(entry.published_parsed)
+        entries.append(
+            (
+                entry.get("title", ""),
+                entry.get("link", ""),
+                entry.get("summary", "")[:500],
+                entry.get("author", ""),
+                published,
+            )
+        )
+    return entries
+
+
+def parse_trending(data: bytes, encoding: str | None = None) -> list[TrendingRepo]:
+    soup = BeautifulSoup(
+        data, HTML_PARSER, parse_only=TRENDING_ROWS, from_encoding=encoding
+    )
+    repos = []
+    for repo in soup.find_all("article", class_="Box-row"):
+        name_tag = repo.select_one("h2 a")
+        if not name_tag:
+            continue
+        repo_path = name_tag["href"].strip("/")
+        desc_tag = repo.select_one("p")
+        description = desc_tag.get_text(strip=True) if desc_tag else ""
+        stars = 0
+        star_tag = repo.select_one('a[href$="/stargazers"]')
+        if star_tag:
+            star_text = star_tag.get_text(strip=True).replace(",", "")
+            try:
+                stars = int(star_text)
+            except ValueError:
+                pass
+        language = ""
+        lang_tag = repo.select_one('[itemprop="programmingLanguage"]')
+        if lang_tag:
+            language = lang_tag.get_text(strip=True)
+        repos.append((repo_path, description, stars, language))
+    return repos
+
+
+def _select_value(el, spec: str | None, default_attr: str | None = None) -> str:
+    """Text (or ``attr`` of ``css@attr``) of the first match of ``spec``."""
+    if not spec:
+        return ""
+    css, _, attr = spec.partition("@")
+    attr = attr or default_attr
+    target = el.select_one(css) if css else el
+    if target is None:
+        return ""
+    if attr:
+        return str(target.get(attr, "")).strip()
+    return target.get_text(strip=True)
+
+
+def parse_listing(
+    data: bytes, encoding: str | None, base_url: str, selectors: dict[str, str]
+) -> list[ListingItem]:
+    """Extract list items from an HTML page using CSS selectors.
+
+    ``selectors`` holds ``item`` plus ``title``, ``link``, ``score`` and
+    ``date``, each relative to an item; ``css@attr`` reads an attribute.
+    ``link`` defaults to the title element's href. Without ``encoding``
+    BeautifulSoup detects it from the bytes (``<meta charset>`` included).
+    """
+    soup = BeautifulSoup(data, HTML_PARSER, from_encoding=encoding)
+    items = []
+    for el in soup.select(selectors["item"]):
+        title = _select_value(el, selectors.get("title"))
+        link = _select_value(el, selectors.get("link") or selectors.get("title"), "href")
+        if not title or not link:
+            continue
+        score_text = _select_value(el, selectors.get("score")).replace(",", "")
+        match = re.search(r"\d+", score_text)
+        items.append(
+            (
+                title,
+                urljoin(base_url, link),
+                int(match.group()) if match else 0,
+                _select_value(el, selectors.get("date")),
+            )
+        )
+    return items
+
+
+class ParseExecutor:
+    """Runs parser functions in a thread or process pool.
+
+    ``executor: thread`` (the default) without ``max_workers`` reuses the
+    loop's default thread pool; ``executor: process`` sidesteps the GIL for
+    large feeds at the cost of shipping bytes to worker processes.
+    """
+
+    def __init__(self, config: dict[str, Any] | None = None):
+        self.config = config or {}
+        self.kind = self.config.get("executor", "thread")
+        self.max_workers = self.config.get("max_workers")
+        if self.kind not in ("thread", "process"):
+            raise ValueError(f"Unknown parse executor: {self.kind}")
+        self._pool: Executor | None = None
+
+    def _get_pool(self) -> Executor | None:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            elif self.max_workers:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="parse"
+                )
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), fn, *args)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
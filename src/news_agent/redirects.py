@@ -0,0 +1,105 @@
+"""Resolve shortener and tracking links to their final URLs before dedup."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from yarl import URL
+
+from news_agent.http_client import HttpClient
+from news_agent.models import Article
+
+if TYPE_CHECKING:
+    from news_agent.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOSTS = [
+    "t.co",
+    "bit.ly",
+    "buff.ly",
+    "dlvr.it",
+    "feedproxy.google.com",
+    "feeds.feedburner.com",
+    "goo.gl",
+    "lnkd.in",
+    "ow.ly",
+    "tinyurl.com",
+    "trib.al",
+]
+# Some shorteners refuse HEAD; those get a GET whose body is never read.
+HEAD_REFUSED = {403, 405, 501}
+
+
+class RedirectResolver:
+    """Follows redirects for links on known redirector hosts.
+
+    Resolutions are cached in storage for ``ttl`` seconds, so each short
+    link costs one request across runs. Unresolvable links are left as is
+    and retried next run.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        http: HttpClient | None = None,
+        storage: Storage | None = None,
+    ):
+        self.config = config or {}
+        self.http = http
+        self.storage = storage
+        self.hosts = set(self.config.get("hosts", DEFAULT_HOSTS))
+        self.resolve_all = self.config.get("resolve_all", False)
+        self.concurrency = self.config.get("concurrency", 16)
+        self.ttl = self.config.get("ttl", 30 * 86400)
+        self.timeout = self.config.get("timeout", 10)
+
+    def wants(self, url: str) -> bool:
+        return self.resolve_all or (URL(url).host or "") in self.hosts
+
+    async def resolve_articles(self, articles: list[Article]) -> int:
+        """Rewrite article URLs in place; returns how many changed."""
+        urls = list(dict.fromkeys(a.url for a in articles if self.wants(a.url)))
+        if not urls:
+            return 0
+        resolved = await self.resolve(urls)
+        changed = 0
+        for article in articles:
+            target = resolved.get(article.url)
+            if target and target != article.url:
+                article.url = target
+                changed += 1
+        logger.info(f"Redirects: {len(urls)} links checked, {changed} articles rewritten")
+        return changed
+
+    async def resolve(self, urls: list[str]) -> dict[str, str]:
+        cached: dict[str, str] = {}
+        if self.storage is not None:
+            cached = await self.storage.get_redirects(urls, self.ttl)
+        missing = [u for u in urls if u not in cached]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(url: str) -> str | None:
+            async with semaphore:
+                return await self._follow(url)
+
+        targets = await asyncio.gather(*(bounded(u) for u in missing))
+        fresh = {url: target for url, target in zip(missing, targets) if target}
+        if self.storage is not None and fresh:
+            await self.storage.save_redirects(fresh)
+        logger.debug(f"Redirects: {len(cached)} cached, {len(fresh)} resolved")
+        return {**cached, **fresh}
+
+    async def _follow(self, url: str) -> str | None:
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        try:
+            async with self.http.head(url, allow_redirects=True, timeout=timeout) as resp:
+                if resp.status not in HEAD_REFUSED:
+                    return str(resp.url) if resp.status < 400 else None
+            async with self.http.get(url, allow_redirects=True, timeout=timeout) as resp:
+                return str(resp.url) if resp.status < 400 else None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"Could not resolve {url}: {e!r}")
+            return None
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from yarl import URL
+
+from news_agent.latency import LatencyTracker
+
+if TYPE_CHECKING:
+    from news_agent.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised instead of contacting a host whose circuit breaker is open."""
+
+
+def _release_response(task: asyncio.Future) -> None:
+    if not task.cancelled() and task.exception() is None:
+        task.result().release()
+
+
+class RequestScheduler:
+    """Per-host politeness, retries and a cross-run circuit breaker.
+
+    Hosts that failed in ``breaker_threshold`` consecutive runs get a single
+    cheap probe (``probe_timeout``) before any real request; if the probe
+    fails the host is skipped for the rest of the run.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        latency: LatencyTracker | None = None,
+    ):
+        self.config = config or {}
+        self.latency = latency or LatencyTracker(self.config)
+        self.limit_per_host = self.config.get("limit_per_host", 8)
+        self.host_limits: dict[str, int] = self.config.get("host_limits", {})
+        # Hedging spends extra requests, so it is opt-in per host.
+        self.hedge_hosts: set[str] = set(self.config.get("hedge_hosts", []))
+        self.max_retries = self.config.get("max_retries", 3)
+        self.backoff_base = self.config.get("backoff_base", 0.5)
+        self.backoff_max = self.config.get("backoff_max", 30.0)
+        self.retry_after_max = self.config.get("retry_after_max", 60.0)
+        self.breaker_threshold = self.config.get("breaker_threshold", 3)
+        self.probe_timeout = self.config.get("probe_timeout", 5.0)
+        self.failed_runs: dict[str, int] = {}
+        self.succeeded: set[str] = set()
+        self.failed: set[str] = set()
+        self.hedged = 0
+        self._open: set[str] = set()
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._probe_locks: dict[str, asyncio.Lock] = {}
+
+    async def load(self, storage: Storage) -> None:
+        self.failed_runs = await storage.get_host_failures()
+        tripped = [h for h, n in self.failed_runs.items() if n >= self.breaker_threshold]
+        if tripped:
+            logger.info(f"Circuit breaker: probing {len(tripped)} failing hosts")
+
+    async def save(self, storage: Storage) -> None:
+        await storage.save_host_outcomes(self.succeeded, self.failed - self.succeeded)
+
+    def semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            limit = self.host_limits.get(host, self.limit_per_host)
+            self._semaphores[host] = asyncio.Semaphore(limit)
+        return self._semaphores[host]
+
+    def is_tripped(self, host: str) -> bool:
+        return (
+            host not in self.succeeded
+            and self.failed_runs.get(host, 0) >= self.breaker_threshold
+        )
+
+    async def send(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        *,
+        max_retries: int | None = None,
+        hedge: bool = True,
+        **kwargs,
+    ) -> aiohttp.ClientResponse:
+        """Send one request under the host's breaker, retry and hedge policy.
+
+        ``max_retries`` overrides the configured retry count and
+        ``hedge=False`` rules out a duplicate request, for callers that pay
+        per request (quota-metered APIs).
+        """
+        host = URL(url).host or ""
+        if host in self._open:
+            raise CircuitOpenError(f"circuit open for {host}")
+        if self.is_tripped(host):
+            lock = self._probe_locks.setdefault(host, asyncio.Lock())
+            async with lock:
+                if host in self._open:
+                    raise CircuitOpenError(f"circuit open for {host}")
+                if self.is_tripped(host):
+                    return await self._probe(session, host, method, url, **kwargs)
+        return await self._send_with_retries(
+            session, host, method, url, max_retries, hedge, **kwargs
+        )
+
+    async def _probe(
+        self, session: aiohttp.ClientSession, host: str, method: str, url: str, **kwargs
+    ) -> aiohttp.ClientResponse:
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=self.probe_timeout)
+        try:
+            resp = await self._attempt(session, host, method, url, False, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._open.add(host)
+            raise CircuitOpenError(f"probe to {host} failed: {e!r}") from e
+        if resp.status in RETRY_STATUSES:
+            self._open.add(host)
+        return resp
+
+    async def _send_with_retries(
+        self,
+        session: aiohttp.ClientSession,
+        host: str,
+        method: str,
+        url: str,
+        max_retries: int | None,
+        hedge: bool,
+        **kwargs,
+    ) -> aiohttp.ClientResponse:
+        retries = self.max_retries if max_retries is None else max_retries
+        if method.upper() not in IDEMPOTENT_METHODS:
+            retries = 0
+        attempt = 0
+        while True:
+            try:
+                resp = await self._attempt(session, host, method, url, hedge, **kwargs)
+            except aiohttp.ClientConnectionError:
+                if attempt >= retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if resp.status not in RETRY_STATUSES or attempt >= retries:
+                    return resp
+                delay = self._retry_after(resp)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                elif delay > self.retry_after_max:
+                    return resp
+                resp.release()
+            attempt += 1
+            logger.debug(f"Retrying {url} in {delay:.1f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+
+    async def _attempt(
+        self,
+        session: aiohttp.ClientSession,
+        host: str,
+        method: str,
+        url: str,
+        hedge: bool,
+        **kwargs,
+    ) -> aiohttp.ClientResponse:
+        key = f"host:{host}"
+        host_timeout = None
+        if "timeout" not in kwargs:
+            # Bounds connect and each socket read, not the whole body download.
+            host_timeout = self.latency.timeout_for(key, None)
+            if host_timeout is not None:
+                kwargs["timeout"] = aiohttp.ClientTimeout(
+                    sock_connect=host_timeout, sock_read=host_timeout
+                )
+        hedge_delay = None
+        if hedge and method.upper() == "GET" and host in self.hedge_hosts:
+            hedge_delay = self.latency.hedge_delay(key)
+        start = time.monotonic()
+        try:
+            if hedge_delay is None:
+                resp = await session.request(method, url, **kwargs)
+            else:
+                resp = await self._hedged(
+                    session, host, hedge_delay, method, url, **kwargs
+                )
+        except asyncio.CancelledError:
+            # A source deadline or an early-closed iterator cancelled this
+            # request; that says nothing about the host itself.
+            raise
+        except Exception as e:
+            # Includes request timeouts: a host that keeps us waiting is
+            # exactly what the breaker should learn about.
+            self.failed.add(host)
+            if isinstance(e, asyncio.TimeoutError):
+                # Recorded at the timeout so slow hosts raise their own
+                # percentile instead of dropping out of the history.
+                elapsed = time.monotonic() - start
+                self.latency.record(key, max(elapsed, host_timeout or 0.0))
+            raise
+        if resp.status in RETRY_STATUSES:
+            self.failed.add(host)
+        else:
+            self.succeeded.add(host)
+            self.latency.record(key, time.monotonic() - start)
+        return resp
+
+    async def _hedged(
+        self,
+        session: aiohttp.ClientSession,
+        host: str,
+        delay: float,
+        method: str,
+        url: str,
+        **kwargs,
+    ) -> aiohttp.ClientResponse:
+        """Send a duplicate request if the first is slower than ``delay``.
+
+        The duplicate waits for a politeness slot of its own. The first
+        successful response wins; the other request is cancelled or, if it
+        already finished, its response is released.
+        """
+        pending = {asyncio.ensure_future(session.request(method, url, **kwargs))}
+        error: BaseException | None = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                self.hedged += 1
+                pending.add(
+                    asyncio.ensure_future(
+                        self._hedge_request(session, host, method, url, **kwargs)
+                    )
+                )
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        for other in done - {task}:
+                            _release_response(other)
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(_release_response)
+
+    async def _hedge_request(
+        self, session: aiohttp.ClientSession, host: str, method: str, url: str, **kwargs
+    ) -> aiohttp.ClientResponse:
+        # The slot covers sending and headers; a winning response is read
+        # under the original request's slot.
+        async with self.semaphore(host):
+            return await session.request(method, url, **kwargs)
+
+    def _backoff(self, attempt: int) -> float:
+        cap = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def _retry_after(resp: aiohttp.ClientResponse) -> float | None:
+        value = resp.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
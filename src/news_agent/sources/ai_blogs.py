@@ -8,5 +8,5 @@ from news_agent.sources.rss import RssSource
 class AiBlogsSource(RssSource):
     name = "ai_blogs"
 
-    def __init__(self, config: dict[str, Any] | None = None):
-        super().__init__(config)
+    def __init__(self, config: dict[str, Any] | None = None, **kwargs):
+        super().__init__(config, **kwargs)
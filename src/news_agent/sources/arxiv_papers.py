@@ -1,59 +1,148 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
-from typing import Any
-
-import aiohttp
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Coroutine
 
+from news_agent.http_client import HttpClient
 from news_agent.models import Article
-from news_agent.sources.base import BaseSource
+from news_agent.sources.base import BaseSource, iter_completed
 
 logger = logging.getLogger(__name__)
 
 HF_DAILY_PAPERS_URL = "https://huggingface.co/api/daily_papers"
 PWC_PAPERS_URL = "https://paperswithcode.com/api/v1/papers/"
 
+# Higher wins when two upstreams disagree on a cached field.
+UPSTREAM_PRIORITY = {"huggingface": 2, "paperswithcode": 1}
+UPVOTE_HISTORY = 60
+# New-style (2401.12345) and old-style (hep-th/9901001, math.GT/0309136) IDs.
+ARXIV_ID_RE = re.compile(
+    r"arxiv\.org/(?:abs|pdf)/((?:[a-z-]+(?:\.[A-Z]{2})?/)?\d{4}\.?\d{3,5})"
+    r"(?:v\d+)?(?:\.pdf)?(?:[?#/]|$)"
+)
+
 
 class ArxivPapersSource(BaseSource):
+    """Trending papers from HuggingFace daily papers and PapersWithCode.
+
+    Both APIs are queried concurrently and each one's papers are yielded as
+    soon as it answers. With storage, paper metadata is cached by arxiv ID
+    so a paper keeps its HF title and upvote history on runs where only
+    PapersWithCode lists it.
+    """
+
     name = "arxiv_papers"
     timeout = 60
 
-    def __init__(self, config: dict[str, Any] | None = None):
-        super().__init__(config)
+    def __init__(self, config: dict[str, Any] | None = None, **kwargs):
+        super().__init__(config, **kwargs)
         self.max_papers = self.config.get("max_papers", 10)
+        self.upvote_ttl = self.config.get("upvote_ttl", 3 * 86400)
+
+    async def _stream(self, http: HttpClient) -> AsyncIterator[list[Article]]:
+        # Each upstream's top ``max_papers`` is yielded as soon as it
+        # arrives, so a hung upstream cannot cost the other one's papers;
+        # run_agent ranks all papers by score when it picks the ones to send.
+        # HF takes priority for duplicate arxiv IDs: a paper PapersWithCode
+        # already yielded gets HF's fields in place instead of a second copy.
+        yielded: dict[str, Article] = {}
+        async for upstream, papers in iter_completed(
+            (
+                self._fetch_upstream("huggingface", self._fetch_huggingface(http)),
+                self._fetch_upstream("paperswithcode", self._fetch_paperswithcode(http)),
+            ),
+            2,
+        ):
+            if upstream == "paperswithcode":
+                papers = {k: v for k, v in papers.items() if k not in yielded}
+            papers = await self._merge_with_cache(upstream, papers)
+            batch = []
+            for arxiv_id, article in papers.items():
+                if arxiv_id in yielded:
+                    self._take_fields(yielded[arxiv_id], article)
+                else:
+                    batch.append((arxiv_id, article))
+            batch.sort(key=lambda item: item[1].score, reverse=True)
+            batch = batch[: self.max_papers]
+            yielded.update(batch)
+            yield [article for _, article in batch]
 
-    async def _fetch(self, session: aiohttp.ClientSession) -> list[Article]:
-        hf_papers = await self._fetch_huggingface(session)
-        pwc_papers = await self._fetch_paperswithcode(session)
-
-        # Merge: HF takes priority for duplicate arxiv IDs
-        papers_by_id: dict[str, Article] = {}
-        for article in pwc_papers:
-            arxiv_id = self._extract_arxiv_id(article.url)
-            if arxiv_id:
-                papers_by_id[arxiv_id] = article
-
-        for article in hf_papers:
-            arxiv_id = self._extract_arxiv_id(article.url)
-            if arxiv_id:
-                papers_by_id[arxiv_id] = article
-
-        merged = list(papers_by_id.values())
-        merged.sort(key=lambda a: a.score, reverse=True)
-        return merged[: self.max_papers]
+    @staticmethod
+    async def _fetch_upstream(
+        upstream: str, fetch: Coroutine[Any, Any, dict[str, Article]]
+    ) -> tuple[str, dict[str, Article]]:
+        return upstream, await fetch
 
-    async def _fetch_huggingface(self, session: aiohttp.ClientSession) -> list[Article]:
+    @staticmethod
+    def _take_fields(target: Article, source: Article) -> None:
+        target.title = source.title
+        target.summary = source.summary
+        target.score = source.score
+        target.comments_count = source.comments_count
+        target.published_at = source.published_at or target.published_at
+
+    async def _merge_with_cache(
+        self, upstream: str, papers: dict[str, Article]
+    ) -> dict[str, Article]:
+        """Fill papers from the cache and record this upstream's fields.
+
+        A field supplied by a higher-priority upstream on an earlier run is
+        kept over a lower-priority one, and the latest HF upvote count is
+        used as score when only PapersWithCode lists the paper today, as
+        long as it is no older than ``upvote_ttl`` seconds.
+        """
+        if self.storage is None or not papers:
+            return papers
+        cached = await self.storage.get_papers(list(papers))
+        now_dt = datetime.now(timezone.utc)
+        now = now_dt.isoformat()
+        fresh_since = now_dt - timedelta(seconds=self.upvote_ttl)
+        records = []
+        for arxiv_id, article in papers.items():
+            record = cached.get(arxiv_id) or {
+                "arxiv_id": arxiv_id,
+                "title": "",
+                "abstract": "",
+                "upvotes": [],
+                "field_sources": {},
+            }
+            for field, value in (("title", article.title), ("abstract", article.summary)):
+                current = record["field_sources"].get(field)
+                if value and (
+                    current is None
+                    or UPSTREAM_PRIORITY[upstream] >= UPSTREAM_PRIORITY.get(current, 0)
+                ):
+                    record[field] = value
+                    record["field_sources"][field] = upstream
+            if upstream == "huggingface":
+                record["upvotes"] = (record["upvotes"] + [[now, article.score]])[
+                    -UPVOTE_HISTORY :
+                ]
+            article.title = record["title"]
+            article.summary = record["abstract"]
+            if record["upvotes"]:
+                recorded_at, upvotes = record["upvotes"][-1]
+                if datetime.fromisoformat(recorded_at) >= fresh_since:
+                    article.score = upvotes
+            records.append(record)
+        await self.storage.save_papers(records)
+        return papers
+
+    async def _fetch_huggingface(self, http: HttpClient) -> dict[str, Article]:
         try:
-            async with session.get(
+            async with http.get(
                 HF_DAILY_PAPERS_URL, params={"limit": 30}
             ) as resp:
                 resp.raise_for_status()
-                data = await resp.json()
+                data = await self.read_json(http, resp)
 
-            articles = []
+            papers: dict[str, Article] = {}
             for paper in data:
                 arxiv_id = paper.get("id", "") or paper.get("paper", {}).get("id", "")
+                if not arxiv_id or arxiv_id in papers:
+                    continue
                 title = paper.get("title", "") or paper.get("paper", {}).get("title", "")
                 summary = paper.get("summary", "") or paper.get("paper", {}).get("summary", "")
                 published = paper.get("publishedAt", "") or paper.get("paper", {}).get("publishedAt", "")
@@ -67,38 +156,38 @@ class ArxivPapersSource(BaseSource):
                     except (ValueError, AttributeError):
                         pass
 
-                articles.append(
-                    Article(
-                        source=self.name,
-                        title=title,
-                        url=f"https://arxiv.org/abs/{arxiv_id}",
-                        summary=summary,
-                        score=paper.get("upvotes", 0),
-                        comments_count=paper.get("numComments", 0),
-                        published_at=published_at,
-                        tags=["arxiv", "ai"],
-                    )
+                papers[arxiv_id] = Article(
+                    source=self.name,
+                    title=title,
+                    url=f"https://arxiv.org/abs/{arxiv_id}",
+                    summary=summary,
+                    score=paper.get("upvotes", 0),
+                    comments_count=paper.get("numComments", 0),
+                    published_at=published_at,
+                    tags=["arxiv", "ai"],
                 )
-            return articles
+            return papers
         except Exception as e:
             logger.warning(f"[{self.name}] HuggingFace fetch failed: {e}")
-            return []
+            return {}
 
     async def _fetch_paperswithcode(
-        self, session: aiohttp.ClientSession
-    ) -> list[Article]:
+        self, http: HttpClient
+    ) -> dict[str, Article]:
         try:
-            async with session.get(
+            async with http.get(
                 PWC_PAPERS_URL,
                 params={"ordering": "-published", "items_per_page": 30, "page": 1},
             ) as resp:
                 resp.raise_for_status()
-                data = await resp.json()
+                data = await self.read_json(http, resp)
 
-            articles = []
+            papers: dict[str, Article] = {}
             for paper in data.get("results", []):
-                arxiv_id = paper.get("arxiv_id", "")
-                if not arxiv_id:
+                arxiv_id = paper.get("arxiv_id", "") or self._extract_arxiv_id(
+                    paper.get("url_abs", "")
+                )
+                if not arxiv_id or arxiv_id in papers:
                     continue
 
                 published_at = None
@@ -113,24 +202,21 @@ class ArxivPapersSource(BaseSource):
 
                 url_abs = f"https://arxiv.org/abs/{arxiv_id}"
 
-                articles.append(
-                    Article(
-                        source=self.name,
-                        title=paper.get("title", ""),
-                        url=url_abs,
-                        summary=paper.get("abstract", ""),
-                        published_at=published_at,
-                        tags=["arxiv", "ai"],
-                    )
+                papers[arxiv_id] = Article(
+                    source=self.name,
+                    title=paper.get("title", ""),
+                    url=url_abs,
+                    summary=paper.get("abstract", ""),
+                    published_at=published_at,
+                    tags=["arxiv", "ai"],
                 )
-            return articles
+            return papers
         except Exception as e:
             logger.warning(f"[{self.name}] PapersWithCode fetch failed: {e}")
-            return []
+            return {}
 
     @staticmethod
     def _extract_arxiv_id(url: str) -> str:
-        """Extract arxiv ID from a URL like https://arxiv.org/abs/2401.12345."""
-        if "arxiv.org/abs/" in url:
-            return url.split("arxiv.org/abs/")[-1].split("?")[0].strip("/")
-        return ""
+        """Extract arxiv ID from an abs or pdf URL, dropping any version suffix."""
+        match = ARXIV_ID_RE.search(url or "")
+        return match.group(1) if match else ""
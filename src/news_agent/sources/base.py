@@ -1,37 +1,187 @@
 from __future__ import annotations
 
-import abc
 import asyncio
 import logging
-from typing import Any
-
-import aiohttp
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Coroutine, Iterable, TypeVar
 
+from news_agent.http_client import Body, HttpClient
 from news_agent.models import Article
+from news_agent.parsing import ParseExecutor
+
+if TYPE_CHECKING:
+    from news_agent.storage import Storage
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+RECENT_LINKS = 50
+
+
+@dataclass
+class HighWaterMark:
+    """Newest published timestamp and most recent links seen in one feed.
+
+    Links stand in for GUIDs: they are what articles are deduplicated on.
+    Only links decide what was seen; ``newest`` is informational, since
+    pinned or edited entries make publish order unreliable.
+    """
+
+    newest: float | None = None
+    recent: list[str] = field(default_factory=list)
+
+    def is_seen(self, link: str) -> bool:
+        return link in self.recent
+
+    def advance(self, entries: Iterable[tuple[str, float | None]]) -> None:
+        links = []
+        for link, published in entries:
+            links.append(link)
+            if published is not None and (self.newest is None or published > self.newest):
+                self.newest = published
+        self.recent = list(dict.fromkeys(links + self.recent))[:RECENT_LINKS]
+
+
+async def iter_completed(
+    coros: Iterable[Coroutine[Any, Any, T]], limit: int
+) -> AsyncIterator[T]:
+    """Run coroutines at most ``limit`` at a time, yielding results as they finish.
+
+    Closing the iterator early (e.g. on a source deadline) cancels the rest.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(coro: Coroutine[Any, Any, T]) -> T:
+        try:
+            async with semaphore:
+                return await coro
+        finally:
+            coro.close()
+
+    tasks = [asyncio.ensure_future(bounded(c)) for c in coros]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class BaseSource:
+    """A news source.
+
+    Subclasses override ``_stream`` to yield batches of articles as each
+    sub-request finishes; batches yielded before the deadline are kept on
+    timeout. One-shot sources may instead implement ``_fetch`` and return
+    everything at once. A subclass implementing neither cannot be created.
+    """
 
-class BaseSource(abc.ABC):
     name: str = "base"
     timeout: int = 30
 
-    def __init__(self, config: dict[str, Any] | None = None):
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        *,
+        http: HttpClient | None = None,
+        executor: ParseExecutor | None = None,
+        storage: Storage | None = None,
+    ):
+        cls = type(self)
+        if cls._stream is BaseSource._stream and cls._fetch is BaseSource._fetch:
+            raise TypeError(f"{cls.__name__} must implement _stream or _fetch")
         self.config = config or {}
+        self.max_age_days = self.config.get("max_age_days")
+        self.max_bytes = self.config.get("max_bytes")
+        self.oversize = self.config.get("oversize")
+        self.http = http
+        self.executor = executor or ParseExecutor()
+        self.storage = storage
 
     async def fetch(self) -> list[Article]:
+        articles: list[Article] = []
+        async for batch in self.stream():
+            articles.extend(batch)
+        return articles
+
+    async def stream(self) -> AsyncIterator[list[Article]]:
+        if self.http is not None:
+            async for batch in self._stream_with(self.http):
+                yield batch
+            return
+        async with HttpClient() as http:
+            async for batch in self._stream_with(http):
+                yield batch
+
+    async def _stream_with(self, http: HttpClient) -> AsyncIterator[list[Article]]:
+        # The timeout comes from this source's latency history when there is
+        # enough of it, else the class default. Only the wait for the next
+        # batch is under the deadline, never the consumer's handling of one.
+        key = f"source:{self.name}"
+        timeout = http.latency.timeout_for(key, self.timeout)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        kept = 0
+        batches = self._stream(http)
         try:
-            async with aiohttp.ClientSession() as session:
-                return await asyncio.wait_for(
-                    self._fetch(session), timeout=self.timeout
-                )
+            while True:
+                async with asyncio.timeout_at(start + timeout):
+                    try:
+                        batch = await anext(batches)
+                    except StopAsyncIteration:
+                        break
+                if batch:
+                    kept += len(batch)
+                    yield batch
         except asyncio.TimeoutError:
-            logger.warning(f"[{self.name}] fetch timed out after {self.timeout}s")
-            return []
+            logger.warning(
+                f"[{self.name}] fetch timed out after {timeout:.0f}s, "
+                f"kept {kept} articles"
+            )
+            # A censored sample, but leaving it out would bias timeouts low.
+            http.latency.record(key, timeout)
+            return
         except Exception as e:
             logger.error(f"[{self.name}] fetch failed: {e}")
-            return []
+            return
+        finally:
+            await batches.aclose()
+        http.latency.record(key, loop.time() - start)
+
+    async def read_body(self, http: HttpClient, resp) -> Body:
+        """Read a response under this source's byte cap and counters."""
+        return await http.read_body(
+            resp, source=self.name, max_bytes=self.max_bytes, oversize=self.oversize
+        )
+
+    async def read_json(self, http: HttpClient, resp) -> Any:
+        return await http.read_json(resp, source=self.name, max_bytes=self.max_bytes)
+
+    def cutoff(self) -> float | None:
+        """Timestamp before which entries are dropped, from ``max_age_days``."""
+        if self.max_age_days is None:
+            return None
+        return time.time() - self.max_age_days * 86400
+
+    async def load_mark(self, key: str) -> HighWaterMark:
+        if self.storage is None:
+            return HighWaterMark()
+        state = await self.storage.get_state(self.name, f"hwm:{key}") or {}
+        return HighWaterMark(state.get("newest"), state.get("recent", []))
+
+    def save_mark(self, key: str, mark: HighWaterMark) -> None:
+        # Staged, not written: run_agent commits marks only after the run's
+        # articles are saved, like HTTP validators.
+        if self.storage is not None:
+            self.storage.stage_state(
+                self.name, f"hwm:{key}", {"newest": mark.newest, "recent": mark.recent}
+            )
+
+    async def _stream(self, http: HttpClient) -> AsyncIterator[list[Article]]:
+        """Yield article batches; the default adapts a one-shot ``_fetch``."""
+        yield await self._fetch(http)
 
-    @abc.abstractmethod
-    async def _fetch(self, session: aiohttp.ClientSession) -> list[Article]:
-        ...
+    async def _fetch(self, http: HttpClient) -> list[Article]:
+        raise NotImplementedError
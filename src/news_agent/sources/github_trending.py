@@ -1,55 +1,69 @@
 from __future__ import annotations
 
-from typing import Any
-
-import aiohttp
-from bs4 import BeautifulSoup
+import asyncio
+import logging
+from typing import Any, AsyncIterator
+from urllib.parse import quote
 
+from news_agent.http_client import HttpClient
 from news_agent.models import Article
+from news_agent.parsing import TrendingRepo, parse_trending
 from news_agent.sources.base import BaseSource
 
+logger = logging.getLogger(__name__)
+
 
 class GitHubTrendingSource(BaseSource):
+    """GitHub trending repositories.
+
+    One page is fetched per ``since`` range and ``languages`` entry ("" is
+    all languages), concurrently; a repo listed on several pages is kept
+    once, from the first page in config order.
+    """
+
     name = "github"
-    URL = "https://github.com/trending?since=daily"
-
-    def __init__(self, config: dict[str, Any] | None = None):
-        super().__init__(config)
-
-    async def _fetch(self, session: aiohttp.ClientSession) -> list[Article]:
-        async with session.get(self.URL) as resp:
-            html = await resp.text()
-        soup = BeautifulSoup(html, "html.parser")
-        articles = []
-        for repo in soup.select("article.Box-row"):
-            name_tag = repo.select_one("h2 a")
-            if not name_tag:
+    URL = "https://github.com/trending"
+
+    def __init__(self, config: dict[str, Any] | None = None, **kwargs):
+        super().__init__(config, **kwargs)
+        self.since = self.config.get("since", ["daily"])
+        self.languages = self.config.get("languages", [""])
+
+    def page_urls(self) -> list[str]:
+        urls = []
+        for language in self.languages:
+            path = f"{self.URL}/{quote(language)}" if language else self.URL
+            urls.extend(f"{path}?since={since}" for since in self.since)
+        return urls
+
+    async def _stream(self, http: HttpClient) -> AsyncIterator[list[Article]]:
+        urls = self.page_urls()
+        results = await asyncio.gather(
+            *(self._fetch_page(http, url) for url in urls), return_exceptions=True
+        )
+        articles: dict[str, Article] = {}
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"[{self.name}] {url} failed: {result}")
                 continue
-            repo_path = name_tag["href"].strip("/")
-            name = repo_path.replace("/", " / ")
-            url = f"https://github.com/{repo_path}"
-            desc_tag = repo.select_one("p")
-            description = desc_tag.get_text(strip=True) if desc_tag else ""
-            stars = 0
-            star_tag = repo.select_one('a[href$="/stargazers"]')
-            if star_tag:
-                star_text = star_tag.get_text(strip=True).replace(",", "")
-                try:
-                    stars = int(star_text)
-                except ValueError:
-                    pass
-            language = ""
-            lang_tag = repo.select_one('[itemprop="programmingLanguage"]')
-            if lang_tag:
-                language = lang_tag.get_text(strip=True)
-            articles.append(
-                Article(
-                    source=self.name,
-                    title=name,
-                    url=url,
-                    summary=description,
-                    score=stars,
-                    tags=[language] if language else [],
-                )
-            )
-        return articles
+            for repo in result:
+                if repo[0] not in articles:
+                    articles[repo[0]] = self._to_article(repo)
+        yield list(articles.values())
+
+    async def _fetch_page(self, http: HttpClient, url: str) -> list[TrendingRepo]:
+        async with http.get(url) as resp:
+            resp.raise_for_status()
+            body = await self.read_body(http, resp)
+        return await self.executor.run(parse_trending, body.data, body.encoding)
+
+    def _to_article(self, repo: TrendingRepo) -> Article:
+        repo_path, description, stars, language = repo
+        return Article(
+            source=self.name,
+            title=repo_path.replace("/", " / "),
+            url=f"https://github.com/{repo_path}",
+            summary=description,
+            score=stars,
+            tags=[language] if language else [],
+        )
@@ -1,43 +1,161 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
-from typing import Any
-
-import aiohttp
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator
 
+from news_agent.http_client import HttpClient
 from news_agent.models import Article
 from news_agent.sources.base import BaseSource
 
 
 class HackerNewsSource(BaseSource):
+    """Hacker News top stories.
+
+    ``mode: items`` fetches each story from the Firebase API, except IDs
+    cached within ``cache_ttl``: those reuse their cached title, URL and
+    author and only have score and comments refreshed from Algolia in bulk.
+    ``mode: bulk`` gets the whole list from the Algolia search endpoint in
+    ``bulk_chunk``-sized requests, so max_items in the hundreds costs a
+    handful of round-trips; IDs Algolia has not indexed yet fall back to
+    Firebase.
+    """
+
     name = "hackernews"
     BASE_URL = "https://hacker-news.firebaseio.com/v0"
+    BULK_URL = "https://hn.algolia.com/api/v1/search"
 
-    def __init__(self, config: dict[str, Any] | None = None):
-        super().__init__(config)
+    def __init__(self, config: dict[str, Any] | None = None, **kwargs):
+        super().__init__(config, **kwargs)
         self.max_items = self.config.get("max_items", 30)
+        self.mode = self.config.get("mode", "items")
+        self.base_url = self.config.get("base_url", self.BASE_URL)
+        self.bulk_url = self.config.get("bulk_url", self.BULK_URL)
+        self.bulk_chunk = self.config.get("bulk_chunk", 100)
+        self.cache_ttl = self.config.get("cache_ttl", 6 * 3600)
 
-    async def _fetch(self, session: aiohttp.ClientSession) -> list[Article]:
-        async with session.get(f"{self.BASE_URL}/topstories.json") as resp:
-            story_ids = await resp.json()
+    async def _stream(self, http: HttpClient) -> AsyncIterator[list[Article]]:
+        async with http.get(f"{self.base_url}/topstories.json") as resp:
+            story_ids = await self.read_json(http, resp)
         story_ids = story_ids[: self.max_items]
-        tasks = [self._fetch_item(session, sid) for sid in story_ids]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        return [r for r in results if isinstance(r, Article)]
-
-    async def _fetch_item(self, session: aiohttp.ClientSession, item_id: int) -> Article:
-        async with session.get(f"{self.BASE_URL}/item/{item_id}.json") as resp:
-            data = await resp.json()
-        url = data.get("url", "")
-        if not url:
-            url = f"https://news.ycombinator.com/item?id={item_id}"
+        if self.mode == "bulk":
+            items = await self._fetch_bulk(http, story_ids)
+        else:
+            items = await self._fetch_items(http, story_ids)
+        cutoff = self.cutoff()
+        yield [
+            self._to_article(items[sid])
+            for sid in story_ids
+            if sid in items and (cutoff is None or items[sid]["time"] >= cutoff)
+        ]
+
+    async def _fetch_items(
+        self, http: HttpClient, story_ids: list[int]
+    ) -> dict[int, dict[str, Any]]:
+        cached: dict[int, dict[str, Any]] = {}
+        if self.storage is not None:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.cache_ttl)
+            known = await self.storage.get_hn_items(story_ids)
+            cached = {sid: c for sid, c in known.items() if c["fetched_at"] >= cutoff}
+        # Only the static fields are reused from the cache: score and comment
+        # counts of cached IDs are refreshed in bulk, for the score-jump rule.
+        hits = await self._search(
+            http, list(cached), attributesToRetrieve="points,num_comments"
+        )
+        items: dict[int, dict[str, Any]] = {}
+        for hit in hits:
+            item_id = int(hit["objectID"])
+            if item_id in cached:
+                items[item_id] = {
+                    **cached[item_id],
+                    "score": hit.get("points") or 0,
+                    "descendants": hit.get("num_comments") or 0,
+                }
+        missing = [sid for sid in story_ids if sid not in items]
+        items.update(await self._fetch_firebase(http, missing))
+        if self.storage is not None:
+            await self.storage.save_hn_items(list(items.values()))
+        return items
+
+    async def _fetch_firebase(
+        self, http: HttpClient, story_ids: list[int]
+    ) -> dict[int, dict[str, Any]]:
+        results = await asyncio.gather(
+            *(self._fetch_item(http, sid) for sid in story_ids), return_exceptions=True
+        )
+        return {r["id"]: r for r in results if isinstance(r, dict)}
+
+    async def _fetch_item(self, http: HttpClient, item_id: int) -> dict[str, Any]:
+        async with http.get(f"{self.base_url}/item/{item_id}.json") as resp:
+            data = await self.read_json(http, resp)
+        return {
+            "id": item_id,
+            "title": data.get("title", ""),
+            "url": data.get("url", "") or self._discussion_url(item_id),
+            "author": data.get("by", ""),
+            "time": data.get("time", 0),
+            "score": data.get("score", 0),
+            "descendants": data.get("descendants", 0),
+        }
+
+    async def _fetch_bulk(
+        self, http: HttpClient, story_ids: list[int]
+    ) -> dict[int, dict[str, Any]]:
+        items = {}
+        for hit in await self._search(http, story_ids):
+            item_id = int(hit["objectID"])
+            items[item_id] = {
+                "id": item_id,
+                "title": hit.get("title") or "",
+                "url": hit.get("url") or self._discussion_url(item_id),
+                "author": hit.get("author") or "",
+                "time": hit.get("created_at_i") or 0,
+                "score": hit.get("points") or 0,
+                "descendants": hit.get("num_comments") or 0,
+            }
+        # Stories too new for the Algolia index come from Firebase instead.
+        missing = [sid for sid in story_ids if sid not in items]
+        items.update(await self._fetch_firebase(http, missing))
+        if self.storage is not None:
+            await self.storage.save_hn_items(list(items.values()))
+        return items
+
+    async def _search(
+        self, http: HttpClient, story_ids: list[int], **params: Any
+    ) -> list[dict[str, Any]]:
+        """Algolia hits for ``story_ids``, ``bulk_chunk`` IDs per request."""
+        chunks = [
+            story_ids[i : i + self.bulk_chunk]
+            for i in range(0, len(story_ids), self.bulk_chunk)
+        ]
+        results = await asyncio.gather(
+            *(self._search_chunk(http, chunk, params) for chunk in chunks),
+            return_exceptions=True,
+        )
+        return [hit for r in results if isinstance(r, list) for hit in r]
+
+    async def _search_chunk(
+        self, http: HttpClient, story_ids: list[int], params: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        # Parenthesised Algolia tags are ORed: one request for the whole chunk.
+        tags = "(" + ",".join(f"story_{sid}" for sid in story_ids) + ")"
+        params = {"tags": tags, "hitsPerPage": len(story_ids), **params}
+        async with http.get(self.bulk_url, params=params) as resp:
+            resp.raise_for_status()
+            data = await self.read_json(http, resp)
+        return data.get("hits", [])
+
+    @staticmethod
+    def _discussion_url(item_id: int) -> str:
+        return f"https://news.ycombinator.com/item?id={item_id}"
+
+    def _to_article(self, item: dict[str, Any]) -> Article:
         return Article(
             source=self.name,
-            title=data.get("title", ""),
-            url=url,
-            author=data.get("by", ""),
-            score=data.get("score", 0),
-            comments_count=data.get("descendants", 0),
-            published_at=datetime.fromtimestamp(data.get("time", 0), tz=timezone.utc),
+            title=item["title"],
+            url=item["url"],
+            author=item["author"],
+            score=item["score"],
+            comments_count=item["descendants"],
+            published_at=datetime.fromtimestamp(item["time"], tz=timezone.utc),
         )
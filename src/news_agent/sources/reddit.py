@@ -1,59 +1,127 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, AsyncIterator
 
 import aiohttp
 
+from news_agent.http_client import HttpClient
 from news_agent.models import Article
-from news_agent.sources.base import BaseSource
+from news_agent.sources.base import BaseSource, iter_completed
+
+logger = logging.getLogger(__name__)
 
 
 class RedditSource(BaseSource):
     name = "reddit"
+    API_URL = "https://oauth.reddit.com"
+    TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
 
-    def __init__(self, config: dict[str, Any] | None = None):
-        super().__init__(config)
+    def __init__(self, config: dict[str, Any] | None = None, **kwargs):
+        super().__init__(config, **kwargs)
         self.subreddits = self.config.get(
             "subreddits", ["technology", "programming"]
         )
         self.client_id = self.config.get("client_id", "")
         self.client_secret = self.config.get("client_secret", "")
+        self.limit = self.config.get("limit", 25)
+        self.pages = self.config.get("pages", 1)
+        self.multireddit = self.config.get("multireddit", False)
+        self.concurrency = self.config.get("concurrency", 4)
+        self._token: str | None = None
+        self._ratelimit_remaining: float | None = None
+        self._ratelimit_reset = 0.0
+
+    async def _stream(self, http: HttpClient) -> AsyncIterator[list[Article]]:
+        await self._ensure_token(http)
+        if self.multireddit:
+            listings = ["+".join(self.subreddits)]
+        else:
+            listings = list(self.subreddits)
+        async for articles in iter_completed(
+            (self._fetch_listing(http, listing) for listing in listings),
+            self.concurrency,
+        ):
+            yield articles
 
-    async def _fetch(self, session: aiohttp.ClientSession) -> list[Article]:
-        token = await self._get_token(session)
-        headers = {"Authorization": f"Bearer {token}", "User-Agent": "NewsAgent/0.1"}
-        articles = []
-        for subreddit in self.subreddits:
-            url = f"https://oauth.reddit.com/r/{subreddit}/hot?limit=25"
-            async with session.get(url, headers=headers) as resp:
-                data = await resp.json()
-            for post in data.get("data", {}).get("children", []):
-                p = post["data"]
-                articles.append(
-                    Article(
-                        source=self.name,
-                        title=p["title"],
-                        url=p["url"],
-                        summary=p.get("selftext", "")[:500],
-                        author=p.get("author", ""),
-                        score=p.get("score", 0),
-                        comments_count=p.get("num_comments", 0),
-                        tags=[p.get("subreddit", "")],
-                        published_at=datetime.fromtimestamp(
-                            p.get("created_utc", 0), tz=timezone.utc
-                        ),
-                    )
-                )
+    async def _fetch_listing(self, http: HttpClient, listing: str) -> list[Article]:
+        """Fetch up to ``pages`` pages of r/<listing>/hot, following ``after``."""
+        articles: list[Article] = []
+        after = None
+        for _ in range(self.pages):
+            url = f"{self.API_URL}/r/{listing}/hot?limit={self.limit}"
+            if after:
+                url += f"&after={after}"
+            data = await self._get_json(http, url)
+            listing_data = data.get("data", {})
+            cutoff = self.cutoff()
+            articles.extend(
+                self._to_article(post["data"])
+                for post in listing_data.get("children", [])
+                if cutoff is None or post["data"].get("created_utc", 0) >= cutoff
+            )
+            after = listing_data.get("after")
+            if not after:
+                break
         return articles
 
-    async def _get_token(self, session: aiohttp.ClientSession) -> str:
+    async def _get_json(self, http: HttpClient, url: str) -> dict[str, Any]:
+        if self._ratelimit_remaining is not None and self._ratelimit_remaining < 1:
+            wait = min(self._ratelimit_reset, 60)
+            logger.info(f"[{self.name}] rate limit exhausted, waiting {wait:.0f}s")
+            await asyncio.sleep(wait)
+        for attempt in range(2):
+            headers = {
+                "Authorization": f"Bearer {self._token}",
+                "User-Agent": "NewsAgent/0.1",
+            }
+            async with http.get(url, headers=headers) as resp:
+                self._update_ratelimit(resp.headers)
+                if resp.status == 401 and attempt == 0:
+                    # Cached token revoked or expired early: get a fresh one.
+                    await self._ensure_token(http, refresh=True)
+                    continue
+                return await self.read_json(http, resp)
+        return {}
+
+    def _update_ratelimit(self, headers) -> None:
+        try:
+            self._ratelimit_remaining = float(headers["X-Ratelimit-Remaining"])
+            self._ratelimit_reset = float(headers.get("X-Ratelimit-Reset", 0))
+        except (KeyError, ValueError):
+            pass
+
+    def _to_article(self, p: dict[str, Any]) -> Article:
+        return Article(
+            source=self.name,
+            title=p["title"],
+            url=p["url"],
+            summary=p.get("selftext", "")[:500],
+            author=p.get("author", ""),
+            score=p.get("score", 0),
+            comments_count=p.get("num_comments", 0),
+            tags=[p.get("subreddit", "")],
+            published_at=datetime.fromtimestamp(
+                p.get("created_utc", 0), tz=timezone.utc
+            ),
+        )
+
+    async def _ensure_token(self, http: HttpClient, refresh: bool = False) -> None:
+        # Kept in memory only: the token outlives a run by under an hour and
+        # the database is uploaded to the Actions cache.
+        if not refresh and self._token:
+            return
+        data = await self._get_token(http)
+        self._token = data["access_token"]
+
+    async def _get_token(self, http: HttpClient) -> dict[str, Any]:
         auth = aiohttp.BasicAuth(self.client_id, self.client_secret)
-        async with session.post(
-            "https://www.reddit.com/api/v1/access_token",
+        async with http.post(
+            self.TOKEN_URL,
             auth=auth,
             data={"grant_type": "client_credentials"},
             headers={"User-Agent": "NewsAgent/0.1"},
         ) as resp:
-            data = await resp.json()
-            return data["access_token"]
+            return await self.read_json(http, resp)
@@ -1,128 +1,223 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import re
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
+from urllib.parse import urlparse
 
+from news_agent.http_client import HttpClient
 from news_agent.models import Article
 from news_agent.sources.base import BaseSource
 
 logger = logging.getLogger(__name__)
 
+TWEET_SELECTOR = 'article[data-testid="tweet"]'
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+STATUS_ID_RE = re.compile(r"/status/(\d+)")
+
+# One round-trip for every rendered tweet instead of ~8 CDP calls each.
+EXTRACT_TWEETS_JS = """
+() => Array.from(document.querySelectorAll('article[data-testid="tweet"]'), (el) => {
+  const text = (sel) => el.querySelector(sel)?.innerText ?? "";
+  const user = el.querySelector('[data-testid="User-Name"] a');
+  const status = el.querySelector('a[href*="/status/"]');
+  const link = el.querySelector('[data-testid="tweetText"] a[href^="http"], a[href^="http"]');
+  return {
+    text: text('[data-testid="tweetText"]'),
+    author: user?.innerText ?? "",
+    status_url: status ? new URL(status.getAttribute("href"), location.origin).href : "",
+    link: link?.href ?? "",
+    like: text('[data-testid="like"]'),
+    retweet: text('[data-testid="retweet"]'),
+    reply: text('[data-testid="reply"]'),
+  };
+})
+"""
+
+# True once the last rendered tweet differs from the one seen before scrolling.
+NEW_TWEETS_JS = """
+(last) => {
+  const tweets = document.querySelectorAll('article[data-testid="tweet"]');
+  const status = tweets[tweets.length - 1]?.querySelector('a[href*="/status/"]');
+  return status && new URL(status.getAttribute("href"), location.origin).href !== last;
+}
+"""
+
 
 class XSource(BaseSource):
     name = "x_com"
     timeout = 60
 
-    def __init__(self, config: dict[str, Any] | None = None):
-        super().__init__(config)
+    def __init__(self, config: dict[str, Any] | None = None, **kwargs):
+        super().__init__(config, **kwargs)
         self.session_file = self.config.get("session_file", "data/x_session.json")
+        self.max_tweets = self.config.get("max_tweets", 30)
+        self.max_new_tweets = self.config.get("max_new_tweets", 100)
+        self.max_scrolls = self.config.get("max_scrolls", 20)
+        self.scroll_timeout = self.config.get("scroll_timeout", 5000)
+        self.cdp_endpoint = self.config.get("cdp_endpoint", "")
+        self.profile_dir = self.config.get("profile_dir", "data/x_profile")
 
-    async def fetch(self) -> list[Article]:
+    async def stream(self) -> AsyncIterator[list[Article]]:
+        # Scraping goes through Playwright, so skip BaseSource's HTTP client.
+        deadline = asyncio.get_running_loop().time() + self.timeout
         try:
-            return await self._fetch_with_playwright()
+            async with asyncio.timeout_at(deadline):
+                batches = [batch async for batch in self._stream(None)]
+        except asyncio.TimeoutError:
+            logger.warning(f"[{self.name}] fetch timed out after {self.timeout}s")
+            return
         except Exception as e:
             logger.error(f"[{self.name}] fetch failed: {e}")
-            return []
+            return
+        for batch in batches:
+            yield batch
 
-    async def _fetch(self, session):
-        return []
+    async def _stream(self, http: HttpClient | None) -> AsyncIterator[list[Article]]:
+        # ``http`` is unused: tweets come from a browser, not the HTTP client.
+        yield await self._fetch_with_playwright()
 
     async def _fetch_with_playwright(self) -> list[Article]:
         from playwright.async_api import async_playwright
 
-        session_path = Path(self.session_file)
-        if not session_path.exists():
-            logger.warning(
-                f"[{self.name}] No session file at {self.session_file}. "
-                "Run `news-agent login-x` first."
-            )
-            return []
-
-        storage_state = json.loads(session_path.read_text())
+        last_seen = None
+        if self.storage is not None:
+            last_seen = await self.storage.get_state(self.name, "last_seen_id")
 
         async with async_playwright() as p:
+            if self.cdp_endpoint:
+                try:
+                    tweets = await self._fetch_from_worker(p, last_seen)
+                    return self._finish(tweets)
+                except Exception as e:
+                    logger.warning(
+                        f"[{self.name}] browser worker at {self.cdp_endpoint} "
+                        f"unavailable ({e}), launching a cold browser"
+                    )
+
+            session_path = Path(self.session_file)
+            if not session_path.exists():
+                logger.warning(
+                    f"[{self.name}] No session file at {self.session_file}. "
+                    "Run `news-agent login-x` first."
+                )
+                return []
+            storage_state = json.loads(session_path.read_text())
+
             browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(storage_state=storage_state)
-            page = await context.new_page()
+            try:
+                context = await browser.new_context(storage_state=storage_state)
+                tweets = await self._scrape_timeline(context, last_seen)
+            finally:
+                await browser.close()
+        return self._finish(tweets)
+
+    async def _fetch_from_worker(self, p, last_seen: str | None) -> list[dict[str, Any]]:
+        """Scrape in a new tab of the warm context kept by ``news-agent x-browser``."""
+        browser = await p.chromium.connect_over_cdp(self.cdp_endpoint)
+        # Closing a CDP connection only detaches; the worker keeps running.
+        try:
+            return await self._scrape_timeline(browser.contexts[0], last_seen)
+        finally:
+            await browser.close()
 
+    async def _scrape_timeline(self, context, last_seen: str | None) -> list[dict[str, Any]]:
+        await context.route("**/*", self._block_heavy_resources)
+        page = await context.new_page()
+        try:
             await page.goto(
-                "https://x.com/home", wait_until="networkidle", timeout=30000
+                "https://x.com/home", wait_until="domcontentloaded", timeout=30000
             )
-            await page.wait_for_timeout(3000)
+            await page.wait_for_selector(TWEET_SELECTOR, timeout=30000)
+            return await self._collect_tweets(page, last_seen)
+        finally:
+            await page.close()
+            await context.unroute("**/*", self._block_heavy_resources)
 
-            for _ in range(3):
-                await page.evaluate("window.scrollBy(0, 1000)")
-                await page.wait_for_timeout(1500)
+    def _finish(self, tweets: list[dict[str, Any]]) -> list[Article]:
+        # The top of the timeline is where the next run's scroll will stop.
+        # Staged like feed marks: committed only once the articles are saved.
+        newest = next((self._tweet_id(t) for t in tweets if self._tweet_id(t)), None)
+        if newest and self.storage is not None:
+            self.storage.stage_state(self.name, "last_seen_id", newest)
+        return [self._to_article(t) for t in tweets if t["text"]]
 
-            articles = []
-            tweets = await page.query_selector_all('article[data-testid="tweet"]')
+    async def _collect_tweets(
+        self, page, last_seen: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Scroll the timeline until the last-seen tweet or ``max_tweets``.
 
-            for tweet in tweets[:30]:
-                try:
-                    text_el = await tweet.query_selector('[data-testid="tweetText"]')
-                    text = await text_el.inner_text() if text_el else ""
+        With a last-seen ID from the previous run, scrolling continues past
+        ``max_tweets`` up to ``max_new_tweets`` (and ``max_scrolls``) so busy
+        days are not cut short. The timeline is virtualised, so tweets are
+        extracted after every scroll and merged by status URL.
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-                    user_el = await tweet.query_selector(
-                        '[data-testid="User-Name"] a'
-                    )
-                    author, tweet_url = "", ""
-                    if user_el:
-                        author = await user_el.inner_text()
-                        href = await user_el.get_attribute("href")
-                        if href:
-                            tweet_url = f"https://x.com{href}"
-
-                    link_el = await tweet.query_selector('a[href*="http"]')
-                    url = tweet_url
-                    if link_el:
-                        href = await link_el.get_attribute("href")
-                        if href and "x.com" not in href:
-                            url = href
-
-                    likes = await self._get_metric(tweet, '[data-testid="like"]')
-                    retweets = await self._get_metric(
-                        tweet, '[data-testid="retweet"]'
-                    )
-                    replies = await self._get_metric(tweet, '[data-testid="reply"]')
-
-                    if text:
-                        title = text[:100] + ("..." if len(text) > 100 else "")
-                        articles.append(
-                            Article(
-                                source=self.name,
-                                title=title,
-                                url=url or "https://x.com",
-                                summary=text[:500],
-                                author=author,
-                                score=likes + retweets,
-                                comments_count=replies,
-                            )
-                        )
-                except Exception:
-                    continue
-
-            await browser.close()
-            return articles
-
-    async def _get_metric(self, tweet, selector: str) -> int:
-        el = await tweet.query_selector(selector)
-        if el:
-            text = await el.inner_text()
-            text = text.strip().replace(",", "")
-            multiplier = 1
-            if text.endswith("K"):
-                multiplier = 1000
-                text = text[:-1]
-            elif text.endswith("M"):
-                multiplier = 1_000_000
-                text = text[:-1]
+        limit = self.max_new_tweets if last_seen else self.max_tweets
+        tweets: dict[str, dict[str, Any]] = {}
+        for _ in range(self.max_scrolls + 1):
+            batch = await page.evaluate(EXTRACT_TWEETS_JS)
+            for tweet in batch:
+                if last_seen and self._tweet_id(tweet) == last_seen:
+                    return list(tweets.values())[:limit]
+                tweets.setdefault(tweet["status_url"] or tweet["text"], tweet)
+            if not batch or len(tweets) >= limit:
+                break
+            last = batch[-1]["status_url"]
+            await page.evaluate("window.scrollBy(0, window.innerHeight * 2)")
             try:
-                return int(float(text) * multiplier)
-            except (ValueError, TypeError):
-                return 0
-        return 0
+                await page.wait_for_function(
+                    NEW_TWEETS_JS, arg=last, timeout=self.scroll_timeout
+                )
+            except PlaywrightTimeoutError:
+                break
+        return list(tweets.values())[:limit]
+
+    @staticmethod
+    def _tweet_id(tweet: dict[str, Any]) -> str | None:
+        match = STATUS_ID_RE.search(tweet["status_url"])
+        return match.group(1) if match else None
+
+    @staticmethod
+    async def _block_heavy_resources(route) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _to_article(self, tweet: dict[str, Any]) -> Article:
+        text = tweet["text"]
+        url = tweet["status_url"]
+        if tweet["link"] and "x.com" not in tweet["link"]:
+            url = tweet["link"]
+        return Article(
+            source=self.name,
+            title=text[:100] + ("..." if len(text) > 100 else ""),
+            url=url or "https://x.com",
+            summary=text[:500],
+            author=tweet["author"],
+            score=self._parse_metric(tweet["like"]) + self._parse_metric(tweet["retweet"]),
+            comments_count=self._parse_metric(tweet["reply"]),
+        )
+
+    @staticmethod
+    def _parse_metric(text: str | None) -> int:
+        text = (text or "").strip().replace(",", "")
+        multiplier = 1
+        if text.endswith("K"):
+            multiplier = 1000
+            text = text[:-1]
+        elif text.endswith("M"):
+            multiplier = 1_000_000
+            text = text[:-1]
+        try:
+            return int(float(text) * multiplier)
+        except (ValueError, TypeError):
+            return 0
 
     async def save_session(self) -> None:
         from playwright.async_api import async_playwright
@@ -146,3 +241,29 @@ class XSource(BaseSource):
             session_path.write_text(json.dumps(storage))
             print(f"Session saved to {self.session_file}")
             await browser.close()
+
+    async def serve_browser(self) -> None:
+        """Keep an authenticated headless browser warm for XSource runs.
+
+        The persistent profile keeps cookies across restarts; the session
+        file from ``login-x`` seeds it the first time. Runs expose it on the
+        port of ``cdp_endpoint`` and connect over CDP instead of launching.
+        """
+        from playwright.async_api import async_playwright
+
+        port = urlparse(self.cdp_endpoint or "http://127.0.0.1:9222").port or 9222
+        async with async_playwright() as p:
+            context = await p.chromium.launch_persistent_context(
+                self.profile_dir,
+                headless=True,
+                args=[f"--remote-debugging-port={port}"],
+            )
+            session_path = Path(self.session_file)
+            if session_path.exists():
+                state = json.loads(session_path.read_text())
+                await context.add_cookies(state.get("cookies", []))
+            print(f"X browser worker listening on port {port}; Ctrl-C to stop.")
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await context.close()
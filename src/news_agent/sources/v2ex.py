@@ -1,48 +1,147 @@
 from __future__ import annotations
 
+import logging
+import time
 from datetime import datetime, timezone
-from typing import Any
-
-import aiohttp
+from typing import Any, AsyncIterator
 
+from news_agent.http_client import HttpClient
 from news_agent.models import Article
-from news_agent.sources.base import BaseSource
+from news_agent.sources.base import BaseSource, iter_completed
+
+logger = logging.getLogger(__name__)
 
 
 class V2exSource(BaseSource):
+    """V2EX node topics, fetched within the API's hourly request quota.
+
+    The quota reported in ``X-Rate-Limit-*`` headers is stored between runs.
+    When it cannot cover every node, the nodes left over are deferred and
+    fetched first on the next run, so large node lists rotate fairly. So are
+    nodes that failed or were cut off by the source deadline. Requests are
+    never retried or hedged: every one of them spends quota.
+    """
+
     name = "v2ex"
     BASE_URL = "https://www.v2ex.com/api/v2"
 
-    def __init__(self, config: dict[str, Any] | None = None):
-        super().__init__(config)
+    def __init__(self, config: dict[str, Any] | None = None, **kwargs):
+        super().__init__(config, **kwargs)
         self.nodes = self.config.get("nodes", ["programmer", "create", "apple"])
+        self.token = self.config.get("token", "")
+        self.concurrency = self.config.get("concurrency", 4)
+        self.reserve = self.config.get("reserve", 10)
+        self._remaining: int | None = None
+        self._reset = 0.0
+        self._deferred: list[str] = []
+        self._done: set[str] = set()
+
+    async def _stream(self, http: HttpClient) -> AsyncIterator[list[Article]]:
+        planned = await self._plan_nodes()
+        try:
+            async for articles in iter_completed(
+                (self._fetch_node(http, node) for node in planned), self.concurrency
+            ):
+                yield articles
+        finally:
+            self._deferred += [
+                n for n in planned if n not in self._done and n not in self._deferred
+            ]
+            if self._deferred:
+                logger.info(
+                    f"[{self.name}] deferred {len(self._deferred)} nodes to stay "
+                    f"within quota ({self._remaining} requests left)"
+                )
+            if self.storage is not None:
+                await self.storage.set_state(
+                    self.name,
+                    "quota",
+                    {"remaining": self._remaining, "reset": self._reset},
+                )
+                await self.storage.set_state(self.name, "deferred", self._deferred)
 
-    async def _fetch(self, session: aiohttp.ClientSession) -> list[Article]:
-        articles = []
+    async def _plan_nodes(self) -> list[str]:
+        """Order nodes deferred-first and cut the list to the known budget."""
+        deferred: list[str] = []
+        if self.storage is not None:
+            quota = await self.storage.get_state(self.name, "quota") or {}
+            if quota.get("remaining") is not None and quota.get("reset", 0) > time.time():
+                self._remaining = quota["remaining"]
+                self._reset = quota["reset"]
+            deferred = await self.storage.get_state(self.name, "deferred") or []
+        order = [n for n in deferred if n in self.nodes]
+        order += [n for n in self.nodes if n not in order]
+        budget = len(order)
+        if self._remaining is not None:
+            budget = max(0, self._remaining - self.reserve)
+        self._deferred = order[budget:]
+        return order[:budget]
+
+    async def _fetch_node(self, http: HttpClient, node: str) -> list[Article]:
+        if self._remaining is not None and self._remaining <= self.reserve:
+            self._deferred.append(node)
+            return []
         headers = {"User-Agent": "NewsAgent/0.1"}
-        for node in self.nodes:
-            url = f"{self.BASE_URL}/nodes/{node}/topics?p=1"
-            try:
-                async with session.get(url, headers=headers) as resp:
-                    topics = await resp.json()
-                for t in topics:
-                    articles.append(
-                        Article(
-                            source=self.name,
-                            title=t.get("title", ""),
-                            url=t.get(
-                                "url",
-                                f"https://www.v2ex.com/t/{t.get('id', '')}",
-                            ),
-                            summary=t.get("content", "")[:500],
-                            author=t.get("member", {}).get("username", ""),
-                            comments_count=t.get("replies", 0),
-                            tags=[node],
-                            published_at=datetime.fromtimestamp(
-                                t.get("created", 0), tz=timezone.utc
-                            ),
-                        )
-                    )
-            except Exception:
-                continue
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        url = f"{self.BASE_URL}/nodes/{node}/topics?p=1"
+        try:
+            async with http.get(url, headers=headers, max_retries=0, hedge=False) as resp:
+                self._update_quota(resp.headers)
+                if resp.status in (403, 429):
+                    logger.warning(f"[{self.name}] rate limited on node {node}")
+                    self._remaining = 0
+                    self._deferred.append(node)
+                    return []
+                resp.raise_for_status()
+                data = await self.read_json(http, resp)
+            # API v2 wraps topics in {"success": ..., "message": ..., "result": [...]}.
+            topics = data.get("result") if isinstance(data, dict) else data
+            if not isinstance(topics, list):
+                raise ValueError(f"unexpected response: {str(data)[:200]}")
+            mark = await self.load_mark(node)
+            cutoff = self.cutoff()
+            fresh = [
+                t
+                for t in topics
+                if not mark.is_seen(self._topic_url(t))
+                and (cutoff is None or t.get("created", 0) >= cutoff)
+            ]
+            articles = [self._to_article(t, node) for t in fresh]
+        except Exception as e:
+            logger.warning(f"[{self.name}] node {node} failed: {e}")
+            return []
+        self._done.add(node)
+        if fresh:
+            mark.advance((self._topic_url(t), t.get("created")) for t in fresh)
+            self.save_mark(node, mark)
         return articles
+
+    def _update_quota(self, headers) -> None:
+        try:
+            remaining = int(headers["X-Rate-Limit-Remaining"])
+        except (KeyError, ValueError):
+            return
+        # Concurrent responses can arrive out of order; the lowest count wins.
+        if self._remaining is None or remaining < self._remaining:
+            self._remaining = remaining
+        try:
+            self._reset = float(headers.get("X-Rate-Limit-Reset", self._reset))
+        except ValueError:
+            pass
+
+    @staticmethod
+    def _topic_url(t: dict[str, Any]) -> str:
+        return t.get("url", f"https://www.v2ex.com/t/{t.get('id', '')}")
+
+    def _to_article(self, t: dict[str, Any], node: str) -> Article:
+        return Article(
+            source=self.name,
+            title=t.get("title", ""),
+            url=self._topic_url(t),
+            summary=t.get("content", "")[:500],
+            author=t.get("member", {}).get("username", ""),
+            comments_count=t.get("replies", 0),
+            tags=[node],
+            published_at=datetime.fromtimestamp(t.get("created", 0), tz=timezone.utc),
+        )
@@ -1,22 +1,67 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+import logging
+import os
+import struct
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any
 
 import aiosqlite
 
+from news_agent.bloom import BloomFilter
 from news_agent.models import Article
+from news_agent.urls import canonicalize
+
+logger = logging.getLogger(__name__)
+
+# Bound on bound parameters per IN (...) query, well under SQLite's limit.
+SQL_CHUNK = 500
+
+ARTICLE_COLUMNS = (
+    "id", "source", "title", "url", "summary", "author", "published_at",
+    "fetched_at", "score", "comments_count", "tags", "llm_score", "llm_reason",
+    "is_recommended", "is_hot", "sent", "canonical_url",
+)
+# The single write path for articles; sqlite3 caches the prepared statement.
+UPSERT_ARTICLE = (
+    f"INSERT INTO articles ({', '.join(ARTICLE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in ARTICLE_COLUMNS)}) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in ARTICLE_COLUMNS[1:])
+)
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
 
 
 class Storage:
-    def __init__(self, db_path: str = "data/news.db"):
+    """SQLite persistence.
+
+    ``config`` tunes the connection: WAL journaling is always on, and
+    ``synchronous`` (NORMAL), ``cache_size`` (KiB, 65536) and ``mmap_size``
+    (bytes, 256 MiB) are applied as pragmas in initialize.
+
+    With ``bloom.enabled`` a memory-mapped Bloom filter over article ids and
+    canonical URLs (``<db_path>.bloom``) is kept in step with every insert,
+    and existence lookups only reach SQLite for keys it reports as present.
+    A missing, stale or overfull filter is rebuilt from the table on open.
+    """
+
+    def __init__(
+        self, db_path: str = "data/news.db", config: dict[str, Any] | None = None
+    ):
         self.db_path = db_path
+        self.config = config or {}
         self._db: aiosqlite.Connection | None = None
+        self._staged_state: dict[tuple[str, str], Any] = {}
+        self.bloom_config: dict[str, Any] = self.config.get("bloom", {})
+        self.bloom_path = self.bloom_config.get("path") or f"{db_path}.bloom"
+        self.bloom: BloomFilter | None = None
 
     async def initialize(self) -> None:
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._db = await aiosqlite.connect(self.db_path)
+        await self._apply_pragmas()
         await self._db.execute("""
             CREATE TABLE IF NOT EXISTS articles (
                 id TEXT PRIMARY KEY,
@@ -34,87 +79,259 @@ class Storage:
                 llm_reason TEXT DEFAULT '',
                 is_recommended INTEGER DEFAULT 0,
                 is_hot INTEGER DEFAULT 0,
-                sent INTEGER DEFAULT 0
+                sent INTEGER DEFAULT 0,
+                canonical_url TEXT
             )
         """)
+        await self._migrate_canonical_urls()
         await self._db.execute(
             "CREATE INDEX IF NOT EXISTS idx_url ON articles(url)"
         )
+        await self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_canonical_url ON articles(canonical_url, fetched_at)"
+        )
         await self._db.execute(
             "CREATE INDEX IF NOT EXISTS idx_sent ON articles(sent, is_recommended)"
         )
+        await self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fetched_at ON articles(fetched_at)"
+        )
+        await self._db.execute("""
+            CREATE TABLE IF NOT EXISTS http_validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        await self._db.execute("""
+            CREATE TABLE IF NOT EXISTS host_health (
+                host TEXT PRIMARY KEY,
+                failed_runs INTEGER DEFAULT 0,
+                last_failure_at TEXT,
+                last_success_at TEXT
+            )
+        """)
+        await self._db.execute("""
+            CREATE TABLE IF NOT EXISTS latency_samples (
+                key TEXT NOT NULL,
+                latency REAL NOT NULL,
+                recorded_at TEXT NOT NULL
+            )
+        """)
+        await self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_latency_key ON latency_samples(key)"
+        )
+        await self._db.execute("""
+            CREATE TABLE IF NOT EXISTS hn_items (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                author TEXT DEFAULT '',
+                time INTEGER DEFAULT 0,
+                score INTEGER DEFAULT 0,
+                descendants INTEGER DEFAULT 0,
+                fetched_at TEXT NOT NULL
+            )
+        """)
+        await self._db.execute("""
+            CREATE TABLE IF NOT EXISTS source_state (
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (source, key)
+            )
+        """)
+        await self._db.execute("""
+            CREATE TABLE IF NOT EXISTS redirects (
+                url TEXT PRIMARY KEY,
+                target TEXT NOT NULL,
+                resolved_at TEXT NOT NULL
+            )
+        """)
+        await self._db.execute("""
+            CREATE TABLE IF NOT EXISTS papers (
+                arxiv_id TEXT PRIMARY KEY,
+                title TEXT DEFAULT '',
+                abstract TEXT DEFAULT '',
+                upvotes TEXT DEFAULT '[]',
+                field_sources TEXT DEFAULT '{}',
+                updated_at TEXT NOT NULL
+            )
+        """)
         await self._db.commit()
+        if self.bloom_config.get("enabled"):
+            await self._open_bloom()
+
+    async def _open_bloom(self) -> None:
+        try:
+            bloom = BloomFilter.open(self.bloom_path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.info(f"Bloom filter unavailable ({e}), rebuilding")
+            await self.rebuild_bloom()
+            return
+        max_rowid = await self._max_rowid()
+        if bloom.rowid < max_rowid:
+            reason = "older than the database"
+        elif bloom.count > bloom.capacity:
+            reason = f"over capacity ({bloom.count} > {bloom.capacity} keys)"
+        else:
+            self.bloom = bloom
+            return
+        bloom.close()
+        logger.info(f"Bloom filter {reason}, rebuilding")
+        await self.rebuild_bloom()
+
+    async def _max_rowid(self) -> int:
+        cursor = await self._db.execute("SELECT MAX(rowid) FROM articles")
+        return (await cursor.fetchone())[0] or 0
+
+    async def rebuild_bloom(self) -> BloomFilter:
+        """Build a fresh filter from the articles table and swap it in.
+
+        Sized for ``bloom.capacity`` articles (two keys each) or twice the
+        current row count, whichever is larger, at ``bloom.error_rate``.
+        """
+        if self.bloom is not None:
+            self.bloom.close()
+            self.bloom = None
+        cursor = await self._db.execute("SELECT COUNT(*), MAX(rowid) FROM articles")
+        rows, max_rowid = await cursor.fetchone()
+        capacity = 2 * max(int(self.bloom_config.get("capacity", 500_000)), 2 * rows)
+        tmp_path = f"{self.bloom_path}.tmp"
+        bloom = BloomFilter.create(
+            tmp_path, capacity, float(self.bloom_config.get("error_rate", 0.001))
+        )
+        try:
+            async with self._db.execute("SELECT id, canonical_url FROM articles") as cursor:
+                async for article_id, canonical_url in cursor:
+                    bloom.add(article_id)
+                    bloom.add(canonical_url)
+            bloom.rowid = max_rowid or 0
+        finally:
+            bloom.close()
+        os.replace(tmp_path, self.bloom_path)
+        self.bloom = BloomFilter.open(self.bloom_path)
+        return self.bloom
+
+    async def _migrate_canonical_urls(self) -> None:
+        """Add and backfill canonical_url on databases created before it existed."""
+        cursor = await self._db.execute("PRAGMA table_info(articles)")
+        if "canonical_url" not in {row[1] for row in await cursor.fetchall()}:
+            await self._db.execute("ALTER TABLE articles ADD COLUMN canonical_url TEXT")
+        cursor = await self._db.execute(
+            "SELECT id, url FROM articles WHERE canonical_url IS NULL"
+        )
+        rows = await cursor.fetchall()
+        if rows:
+            await self._db.executemany(
+                "UPDATE articles SET canonical_url = ? WHERE id = ?",
+                [(canonicalize(url), article_id) for article_id, url in rows],
+            )
+            await self._db.commit()
+
+    async def _apply_pragmas(self) -> None:
+        synchronous = str(self.config.get("synchronous", "NORMAL")).upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous mode: {synchronous}")
+        cache_kib = int(self.config.get("cache_size", 64 * 1024))
+        mmap_size = int(self.config.get("mmap_size", 256 * 1024 * 1024))
+        await self._db.execute("PRAGMA journal_mode = WAL")
+        await self._db.execute(f"PRAGMA synchronous = {synchronous}")
+        # Negative cache_size is in KiB rather than pages.
+        await self._db.execute(f"PRAGMA cache_size = {-cache_kib}")
+        await self._db.execute(f"PRAGMA mmap_size = {mmap_size}")
 
     async def close(self) -> None:
+        if self.bloom is not None:
+            self.bloom.close()
         if self._db:
             await self._db.close()
 
     async def save_article(self, article: Article) -> None:
-        await self._db.execute(
-            """INSERT OR REPLACE INTO articles
-            (id, source, title, url, summary, author, published_at, fetched_at,
-             score, comments_count, tags, llm_score, llm_reason,
-             is_recommended, is_hot, sent)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                article.id,
-                article.source,
-                article.title,
-                article.url,
-                article.summary,
-                article.author,
-                article.published_at.isoformat() if article.published_at else None,
-                article.fetched_at.isoformat(),
-                article.score,
-                article.comments_count,
-                json.dumps(article.tags),
-                article.llm_score,
-                article.llm_reason,
-                int(article.is_recommended),
-                int(article.is_hot),
-                int(article.sent),
-            ),
-        )
-        await self._db.commit()
+        await self.save_articles([article])
 
     async def save_articles(self, articles: list[Article]) -> None:
-        for article in articles:
-            await self._insert_article(article)
+        """Upsert all articles with one executemany in a single transaction."""
+        if not articles:
+            return
+        await self._db.executemany(
+            UPSERT_ARTICLE, [self._article_row(a) for a in articles]
+        )
         await self._db.commit()
+        if self.bloom is not None:
+            for article in articles:
+                self.bloom.add(article.id)
+                self.bloom.add(article.canonical_url)
+            # Recorded last: a crash before this leaves the filter marked stale.
+            self.bloom.rowid = await self._max_rowid()
+            self.bloom.flush()
 
-    async def _insert_article(self, article: Article) -> None:
-        await self._db.execute(
-            """INSERT OR REPLACE INTO articles
-            (id, source, title, url, summary, author, published_at, fetched_at,
-             score, comments_count, tags, llm_score, llm_reason,
-             is_recommended, is_hot, sent)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                article.id,
-                article.source,
-                article.title,
-                article.url,
-                article.summary,
-                article.author,
-                article.published_at.isoformat() if article.published_at else None,
-                article.fetched_at.isoformat(),
-                article.score,
-                article.comments_count,
-                json.dumps(article.tags),
-                article.llm_score,
-                article.llm_reason,
-                int(article.is_recommended),
-                int(article.is_hot),
-                int(article.sent),
-            ),
+    @staticmethod
+    def _article_row(article: Article) -> tuple:
+        return (
+            article.id,
+            article.source,
+            article.title,
+            article.url,
+            article.summary,
+            article.author,
+            article.published_at.isoformat() if article.published_at else None,
+            article.fetched_at.isoformat(),
+            article.score,
+            article.comments_count,
+            json.dumps(article.tags),
+            article.llm_score,
+            article.llm_reason,
+            int(article.is_recommended),
+            int(article.is_hot),
+            int(article.sent),
+            article.canonical_url,
         )
 
     async def article_exists(self, article_id: str) -> bool:
+        if self.bloom is not None and article_id not in self.bloom:
+            return False
         cursor = await self._db.execute(
             "SELECT 1 FROM articles WHERE id = ?", (article_id,)
         )
         return await cursor.fetchone() is not None
 
+    async def get_known_scores(self, articles: list[Article]) -> dict[str, int]:
+        """Latest stored score for each of the articles' canonical URLs.
+
+        A URL missing from the result has never been stored by any source.
+        Chunked IN queries on the canonical_url index replace an
+        article_exists + get_previous_score round-trip per article; with the
+        Bloom filter enabled only its probable hits are queried.
+        """
+        urls = list(dict.fromkeys(a.canonical_url for a in articles))
+        if self.bloom is not None:
+            urls = [u for u in urls if u in self.bloom]
+        scores: dict[str, int] = {}
+        for i in range(0, len(urls), SQL_CHUNK):
+            chunk = urls[i : i + SQL_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            cursor = await self._db.execute(
+                f"""SELECT canonical_url, score FROM (
+                    SELECT canonical_url, score, ROW_NUMBER() OVER (
+                        PARTITION BY canonical_url ORDER BY fetched_at DESC
+                    ) AS rn
+                    FROM articles WHERE canonical_url IN ({placeholders})
+                ) WHERE rn = 1""",
+                chunk,
+            )
+            scores.update(await cursor.fetchall())
+        return scores
+
+    async def get_recent_articles(self, since: datetime) -> list[Article]:
+        cursor = await self._db.execute(
+            "SELECT * FROM articles WHERE fetched_at >= ?", (since.isoformat(),)
+        )
+        return [self._row_to_article(row) for row in await cursor.fetchall()]
+
     async def get_unsent_recommended(self) -> list[Article]:
         cursor = await self._db.execute(
             """SELECT * FROM articles
@@ -136,12 +353,242 @@ class Storage:
 
     async def get_previous_score(self, url: str) -> int | None:
         cursor = await self._db.execute(
-            "SELECT score FROM articles WHERE url = ? ORDER BY fetched_at DESC LIMIT 1",
-            (url,),
+            """SELECT score FROM articles WHERE canonical_url = ?
+            ORDER BY fetched_at DESC LIMIT 1""",
+            (canonicalize(url),),
         )
         row = await cursor.fetchone()
         return row[0] if row else None
 
+    async def get_validator(self, url: str) -> tuple[str | None, str | None, str | None] | None:
+        """Return (etag, last_modified, body_hash) stored for url."""
+        cursor = await self._db.execute(
+            "SELECT etag, last_modified, body_hash FROM http_validators WHERE url = ?",
+            (url,),
+        )
+        row = await cursor.fetchone()
+        return tuple(row) if row else None
+
+    async def save_validators(
+        self, validators: dict[str, tuple[str | None, str | None, str | None]]
+    ) -> None:
+        if not validators:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        await self._db.executemany(
+            """INSERT OR REPLACE INTO http_validators
+            (url, etag, last_modified, body_hash, updated_at)
+            VALUES (?, ?, ?, ?, ?)""",
+            [(url, *v, now) for url, v in validators.items()],
+        )
+        await self._db.commit()
+
+    async def get_host_failures(self) -> dict[str, int]:
+        """Return consecutive failed-run counts for hosts currently failing."""
+        cursor = await self._db.execute(
+            "SELECT host, failed_runs FROM host_health WHERE failed_runs > 0"
+        )
+        return {host: n for host, n in await cursor.fetchall()}
+
+    async def save_host_outcomes(self, succeeded: set[str], failed: set[str]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        await self._db.executemany(
+            """INSERT INTO host_health (host, failed_runs, last_success_at)
+            VALUES (?, 0, ?)
+            ON CONFLICT(host) DO UPDATE SET
+                failed_runs = 0, last_success_at = excluded.last_success_at""",
+            [(host, now) for host in succeeded],
+        )
+        await self._db.executemany(
+            """INSERT INTO host_health (host, failed_runs, last_failure_at)
+            VALUES (?, 1, ?)
+            ON CONFLICT(host) DO UPDATE SET
+                failed_runs = failed_runs + 1,
+                last_failure_at = excluded.last_failure_at""",
+            [(host, now) for host in failed],
+        )
+        await self._db.commit()
+
+    async def get_latency_samples(self, per_key: int) -> dict[str, list[float]]:
+        """Return the most recent ``per_key`` latencies for every key."""
+        cursor = await self._db.execute(
+            """SELECT key, latency FROM (
+                SELECT key, latency,
+                    ROW_NUMBER() OVER (PARTITION BY key ORDER BY rowid DESC) AS rn
+                FROM latency_samples
+            ) WHERE rn <= ?""",
+            (per_key,),
+        )
+        samples: dict[str, list[float]] = {}
+        for key, latency in await cursor.fetchall():
+            samples.setdefault(key, []).append(latency)
+        return samples
+
+    async def record_latencies(
+        self, samples: list[tuple[str, float]], keep_per_key: int
+    ) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        await self._db.executemany(
+            "INSERT INTO latency_samples (key, latency, recorded_at) VALUES (?, ?, ?)",
+            [(key, latency, now) for key, latency in samples],
+        )
+        await self._db.execute(
+            """DELETE FROM latency_samples WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid,
+                        ROW_NUMBER() OVER (PARTITION BY key ORDER BY rowid DESC) AS rn
+                    FROM latency_samples
+                ) WHERE rn > ?
+            )""",
+            (keep_per_key,),
+        )
+        await self._db.commit()
+
+    async def get_hn_items(self, item_ids: list[int]) -> dict[int, dict[str, Any]]:
+        if not item_ids:
+            return {}
+        placeholders = ",".join("?" for _ in item_ids)
+        cursor = await self._db.execute(
+            f"""SELECT id, title, url, author, time, score, descendants, fetched_at
+            FROM hn_items WHERE id IN ({placeholders})""",
+            item_ids,
+        )
+        columns = ("id", "title", "url", "author", "time", "score", "descendants")
+        items = {}
+        for row in await cursor.fetchall():
+            item = dict(zip(columns, row))
+            item["fetched_at"] = datetime.fromisoformat(row[7])
+            items[row[0]] = item
+        return items
+
+    async def save_hn_items(self, items: list[dict[str, Any]]) -> None:
+        """Upsert items; known IDs only get score and descendants refreshed."""
+        if not items:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        await self._db.executemany(
+            """INSERT INTO hn_items
+            (id, title, url, author, time, score, descendants, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                score = excluded.score,
+                descendants = excluded.descendants,
+                fetched_at = excluded.fetched_at""",
+            [
+                (
+                    item["id"], item["title"], item["url"], item["author"],
+                    item["time"], item["score"], item["descendants"], now,
+                )
+                for item in items
+            ],
+        )
+        await self._db.commit()
+
+    async def get_state(self, source: str, key: str) -> Any:
+        """Return a JSON value a source stored between runs, or None."""
+        cursor = await self._db.execute(
+            "SELECT value FROM source_state WHERE source = ? AND key = ?",
+            (source, key),
+        )
+        row = await cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def get_states(self, source: str, prefix: str) -> dict[str, Any]:
+        """All of a source's stored values whose key starts with ``prefix``."""
+        cursor = await self._db.execute(
+            "SELECT key, value FROM source_state WHERE source = ? AND key >= ? AND key < ?",
+            (source, prefix, prefix + "\uffff"),
+        )
+        return {key: json.loads(value) for key, value in await cursor.fetchall()}
+
+    def stage_state(self, source: str, key: str, value: Any) -> None:
+        """Queue a set_state write until commit_staged_state is called."""
+        self._staged_state[(source, key)] = value
+
+    async def commit_staged_state(self) -> None:
+        if not self._staged_state:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        await self._db.executemany(
+            """INSERT OR REPLACE INTO source_state (source, key, value, updated_at)
+            VALUES (?, ?, ?, ?)""",
+            [
+                (source, key, json.dumps(value), now)
+                for (source, key), value in self._staged_state.items()
+            ],
+        )
+        await self._db.commit()
+        self._staged_state = {}
+
+    async def set_state(self, source: str, key: str, value: Any) -> None:
+        await self._db.execute(
+            """INSERT OR REPLACE INTO source_state (source, key, value, updated_at)
+            VALUES (?, ?, ?, ?)""",
+            (source, key, json.dumps(value), datetime.now(timezone.utc).isoformat()),
+        )
+        await self._db.commit()
+
+    async def get_redirects(self, urls: list[str], max_age: float) -> dict[str, str]:
+        """Cached redirect targets for ``urls`` resolved within ``max_age`` seconds."""
+        since = (datetime.now(timezone.utc) - timedelta(seconds=max_age)).isoformat()
+        targets: dict[str, str] = {}
+        for i in range(0, len(urls), SQL_CHUNK):
+            chunk = urls[i : i + SQL_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            cursor = await self._db.execute(
+                f"""SELECT url, target FROM redirects
+                WHERE url IN ({placeholders}) AND resolved_at >= ?""",
+                [*chunk, since],
+            )
+            targets.update(await cursor.fetchall())
+        return targets
+
+    async def save_redirects(self, targets: dict[str, str]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        await self._db.executemany(
+            "INSERT OR REPLACE INTO redirects (url, target, resolved_at) VALUES (?, ?, ?)",
+            [(url, target, now) for url, target in targets.items()],
+        )
+        await self._db.commit()
+
+    async def get_papers(self, arxiv_ids: list[str]) -> dict[str, dict[str, Any]]:
+        if not arxiv_ids:
+            return {}
+        placeholders = ",".join("?" for _ in arxiv_ids)
+        cursor = await self._db.execute(
+            f"""SELECT arxiv_id, title, abstract, upvotes, field_sources
+            FROM papers WHERE arxiv_id IN ({placeholders})""",
+            arxiv_ids,
+        )
+        return {
+            row[0]: {
+                "arxiv_id": row[0],
+                "title": row[1],
+                "abstract": row[2],
+                "upvotes": json.loads(row[3]),
+                "field_sources": json.loads(row[4]),
+            }
+            for row in await cursor.fetchall()
+        }
+
+    async def save_papers(self, papers: list[dict[str, Any]]) -> None:
+        if not papers:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        await self._db.executemany(
+            """INSERT OR REPLACE INTO papers
+            (arxiv_id, title, abstract, upvotes, field_sources, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    p["arxiv_id"], p["title"], p["abstract"],
+                    json.dumps(p["upvotes"]), json.dumps(p["field_sources"]), now,
+                )
+                for p in papers
+            ],
+        )
+        await self._db.commit()
+
     def _row_to_article(self, row) -> Article:
         return Article(
             source=row[1],
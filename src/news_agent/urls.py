@@ -0,0 +1,60 @@
+"""URL canonicalization so one story has one identity across sources."""
+from __future__ import annotations
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "ref_url", "spm", "share", "si",
+    "__twitter_impression", "_hsenc", "_hsmi", "cmpid", "ncid", "sr_share",
+}
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+ARXIV_PATH = re.compile(r"^/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?$")
+REPEATED_SLASHES = re.compile(r"/{2,}")
+
+
+def _is_tracking(key: str) -> bool:
+    key = key.lower()
+    return key.startswith("utm_") or key in TRACKING_PARAMS
+
+
+def canonicalize(url: str) -> str:
+    """Normalise ``url`` for identity comparison, not for fetching.
+
+    Forces https, lowercases the host and drops www./m. style prefixes,
+    default ports, fragments, trailing slashes and tracking parameters;
+    remaining parameters are sorted. arxiv abs/pdf links and their
+    versions collapse to ``https://arxiv.org/abs/<id>``.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    host = parts.hostname
+    if parts.scheme.lower() not in ("http", "https") or not host:
+        return url
+    host = host.rstrip(".")
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix) :]
+            break
+    if port not in (None, 80, 443):
+        host = f"{host}:{port}"
+    path = parts.path
+    if "//" in path:
+        path = REPEATED_SLASHES.sub("/", path)
+    path = path.rstrip("/")
+    if host in ("arxiv.org", "export.arxiv.org"):
+        match = ARXIV_PATH.match(path)
+        if match:
+            return f"https://arxiv.org/abs/{match.group(1)}"
+    query = parts.query and urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking(k)
+        )
+    )
+    return urlunsplit(("https", host, path, query, ""))
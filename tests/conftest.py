@@ -0,0 +1,11 @@
+import pytest
+
+from news_agent.storage import Storage
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    s = Storage(str(tmp_path / "test.db"))
+    await s.initialize()
+    yield s
+    await s.close()
@@ -0,0 +1,31 @@
+import pytest
+
+from news_agent.bloom import BloomFilter
+
+
+def test_bloom_filter_persists_and_reports(tmp_path):
+    path = tmp_path / "seen.bloom"
+    bloom = BloomFilter.create(path, capacity=1000, error_rate=0.01)
+    bloom.update(f"https://example.com/{i}" for i in range(1000))
+    bloom.rowid = 1000
+    bloom.close()
+
+    bloom = BloomFilter.open(path)
+    try:
+        assert all(f"https://example.com/{i}" in bloom for i in range(1000))
+        assert (bloom.count, bloom.rowid) == (1000, 1000)
+        report = bloom.report(probes=5000)
+        assert report["expected_fpr"] < 0.02
+        assert report["measured_fpr"] < 0.03
+    finally:
+        bloom.close()
+
+
+@pytest.mark.parametrize("size", [0, 10, 100])
+def test_truncated_file_rejected(tmp_path, size):
+    path = tmp_path / "seen.bloom"
+    BloomFilter.create(path, capacity=1000).close()
+    with open(path, "r+b") as f:
+        f.truncate(size)
+    with pytest.raises(ValueError):
+        BloomFilter.open(path)
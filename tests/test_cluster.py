@@ -0,0 +1,67 @@
+from news_agent.cluster import StoryClusterer
+from news_agent.models import Article
+
+
+async def test_near_duplicates_merged():
+    articles = [
+        Article(
+            source="hackernews",
+            title="OpenAI releases GPT-5 with improved reasoning",
+            url="https://hn.example.com/1",
+            score=120,
+            comments_count=40,
+            tags=["ai"],
+        ),
+        Article(
+            source="reddit",
+            title="OpenAI releases GPT-5 with improved reasoning!",
+            url="https://reddit.example.com/2",
+            score=300,
+            comments_count=10,
+            tags=["technology"],
+        ),
+        Article(
+            source="rss",
+            title="Rust 2.0 roadmap published by the core team",
+            url="https://blog.example.com/rust",
+            score=5,
+        ),
+    ]
+    result = await StoryClusterer().cluster(articles)
+    assert len(result) == 2
+    merged = next(a for a in result if "GPT-5" in a.title)
+    assert merged.source == "reddit"
+    assert (merged.score, merged.comments_count) == (300, 10)
+    assert (merged.total_score, merged.total_comments) == (420, 50)
+    assert [d.source for d in merged.duplicates] == ["hackernews"]
+    assert merged.tags == ["ai", "technology"]
+
+
+async def test_story_seen_recently_dropped(storage):
+    await storage.save_article(
+        Article(
+            source="hackernews",
+            title="Linux kernel 7.0 released with new scheduler",
+            url="https://kernel.example.com/7.0",
+        )
+    )
+    articles = [
+        Article(
+            source="reddit",
+            title="Linux kernel 7.0 released with new scheduler",
+            url="https://reddit.example.com/kernel",
+        ),
+        Article(source="rss", title="A new static site generator", url="https://ssg.example.com"),
+    ]
+    clusterer = StoryClusterer({"history_days": 3}, storage=storage)
+    result = await clusterer.cluster(articles)
+    assert [a.url for a in result] == ["https://ssg.example.com"]
+    assert [a.url for a in clusterer.covered] == ["https://reddit.example.com/kernel"]
+
+    # The stored row of the same URL (a resurfaced story) is not a duplicate.
+    resurfaced = Article(
+        source="hackernews",
+        title="Linux kernel 7.0 released with new scheduler",
+        url="https://kernel.example.com/7.0",
+    )
+    assert await StoryClusterer(storage=storage).cluster([resurfaced]) == [resurfaced]
@@ -0,0 +1,135 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from news_agent.http_client import BodyTooLarge, HttpClient
+from news_agent.sources.hackernews import HackerNewsSource
+
+
+async def _start_server(app: web.Application) -> TestServer:
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+async def test_connections_reused_per_host():
+    async def handler(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/item", handler)
+    server = await _start_server(app)
+    try:
+        async with HttpClient({"limit_per_host": 1}) as http:
+            for _ in range(5):
+                async with http.get(str(server.make_url("/item"))) as resp:
+                    assert (await resp.json()) == {"ok": True}
+            stats = http.stats()
+    finally:
+        await server.close()
+
+    host_stats = stats[server.host]
+    assert host_stats.requests == 5
+    assert host_stats.new_connections == 1
+    assert host_stats.reused_connections == 4
+    assert host_stats.handshakes_saved == 4
+
+
+async def test_source_uses_injected_client():
+    items = {"1": {"title": "One", "url": "https://one.example", "time": 0}}
+
+    async def topstories(request):
+        return web.json_response([1])
+
+    async def item(request):
+        return web.json_response(items[request.match_info["id"]])
+
+    app = web.Application()
+    app.router.add_get("/v0/topstories.json", topstories)
+    app.router.add_get("/v0/item/{id}.json", item)
+    server = await _start_server(app)
+    try:
+        async with HttpClient() as http:
+            source = HackerNewsSource(
+                {"max_items": 1, "base_url": str(server.make_url("/v0"))}, http=http
+            )
+            articles = await source.fetch()
+            assert http.stats()[server.host].requests == 2
+    finally:
+        await server.close()
+
+    assert [a.title for a in articles] == ["One"]
+
+
+async def test_conditional_get_skips_unchanged_bodies(storage):
+    etag = '"v1"'
+    seen_headers = []
+
+    async def feed(request):
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.Response(body=b"<rss/>", headers={"ETag": etag})
+
+    async def static(request):
+        return web.Response(body=b"<rss/>")
+
+    app = web.Application()
+    app.router.add_get("/feed", feed)
+    app.router.add_get("/static", static)
+    server = await _start_server(app)
+    try:
+        async with HttpClient(storage=storage) as http:
+            for path in ("/feed", "/static"):
+                url = str(server.make_url(path))
+                body = await http.get_if_changed(url)
+                assert body.data == b"<rss/>"
+                http.stage_validator(url, body.validator)
+            await http.commit_validators()
+        async with HttpClient(storage=storage) as http:
+            assert await http.get_if_changed(str(server.make_url("/feed"))) is None
+            assert await http.get_if_changed(str(server.make_url("/static"))) is None
+            assert (http.cache_hits, http.cache_misses) == (2, 0)
+    finally:
+        await server.close()
+
+    assert "If-None-Match" not in seen_headers[0]
+    assert seen_headers[1]["If-None-Match"] == etag
+
+
+async def test_body_reads_capped_and_decoded_incrementally():
+    text = "é" * 100_000  # 200 KB of two-byte characters, split across chunks
+
+    async def handler(request):
+        resp = web.StreamResponse(headers={"Content-Type": "text/plain; charset=utf-8"})
+        await resp.prepare(request)
+        data = text.encode()
+        for i in range(0, len(data), 4097):
+            await resp.write(data[i : i + 4097])
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/big", handler)
+    server = await _start_server(app)
+    url = str(server.make_url("/big"))
+    try:
+        async with HttpClient() as http:
+            async with http.get(url) as resp:
+                assert await http.read_text(resp, source="feeds") == text
+            async with http.get(url) as resp:
+                body = await http.read_body(resp, source="feeds", max_bytes=1000)
+            assert len(body.data) == 1000
+            async with http.get(url) as resp:
+                with pytest.raises(BodyTooLarge):
+                    await http.read_body(
+                        resp, source="feeds", max_bytes=1000, oversize="abort"
+                    )
+            stats = http.read_stats["feeds"]
+    finally:
+        await server.close()
+
+    assert stats.bodies == 3
+    assert (stats.truncated, stats.aborted) == (1, 1)
+    assert 200_000 <= stats.bytes < 300_000
+    assert stats.peak >= 200_000
+    assert stats.in_flight == 0
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from news_agent.http_client import HttpClient
+from news_agent.latency import LatencyTracker, percentile
+from news_agent.models import Article
+from news_agent.sources.base import BaseSource
+
+
+def test_timeout_from_history():
+    tracker = LatencyTracker(
+        {"timeout_multiplier": 2, "min_timeout": 1, "max_timeout": 100, "min_samples": 3}
+    )
+    assert tracker.timeout_for("source:a", 30) == 30
+    tracker.history["source:a"] = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(tracker.history["source:a"], 0.95) == 4.0
+    assert tracker.timeout_for("source:a", 30) == 8.0
+    tracker.history["source:b"] = [0.01] * 5
+    assert tracker.timeout_for("source:b", 30) == 1
+
+
+async def test_latency_history_persisted_and_pruned(storage):
+    tracker = LatencyTracker({"history_size": 3})
+    for latency in (1.0, 2.0, 3.0, 4.0):
+        tracker.record("host:example.com", latency)
+    await tracker.save(storage)
+    reloaded = LatencyTracker({"history_size": 3})
+    await reloaded.load(storage)
+    assert sorted(reloaded.history["host:example.com"]) == [2.0, 3.0, 4.0]
+
+
+async def test_source_timeout_adapts_to_history():
+    class SlowSource(BaseSource):
+        name = "slow"
+
+        async def _stream(self, http):
+            yield [Article(source="slow", title="First", url="https://a.com")]
+            await asyncio.sleep(5)
+            yield [Article(source="slow", title="Second", url="https://b.com")]
+
+    async with HttpClient({"min_timeout": 0.05, "min_samples": 1}) as http:
+        http.latency.history["source:slow"] = [0.01]
+        articles = await SlowSource(http=http).fetch()
+    assert [a.title for a in articles] == ["First"]
+
+
+async def test_slow_get_is_hedged():
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(2)
+        return web.Response(text=f"response {calls}")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with HttpClient({"min_samples": 1, "hedge_hosts": [server.host]}) as http:
+            http.latency.history[f"host:{server.host}"] = [0.05]
+            async with http.get(str(server.make_url("/"))) as resp:
+                assert await resp.text() == "response 2"
+            assert http.scheduler.hedged == 1
+    finally:
+        await server.close()
+
+
+async def test_hedged_request_waits_for_host_slot():
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.3)
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        config = {
+            "min_samples": 1,
+            "hedge_hosts": [server.host],
+            "host_limits": {server.host: 1},
+        }
+        async with HttpClient(config) as http:
+            http.latency.history[f"host:{server.host}"] = [0.01]
+            async with http.get(str(server.make_url("/"))) as resp:
+                assert await resp.text() == "ok"
+    finally:
+        await server.close()
+    assert calls == 1
+
+
+async def test_request_timeout_recorded_as_latency_sample():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.Response(text="late")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    key = f"host:{server.host}"
+    try:
+        async with HttpClient({"min_samples": 1, "min_timeout": 0.1, "max_retries": 0}) as http:
+            http.latency.history[key] = [0.01]
+            with pytest.raises(asyncio.TimeoutError):
+                async with http.get(str(server.make_url("/"))):
+                    pass
+            assert [k for k, _ in http.latency._pending] == [key]
+            assert http.latency._pending[0][1] >= 0.1
+    finally:
+        await server.close()
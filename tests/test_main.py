@@ -1,6 +1,7 @@
+import asyncio
 from unittest.mock import AsyncMock, patch
 
-from news_agent.main import run_agent
+from news_agent.main import fetch_all, run_agent
 from news_agent.models import Article
 
 
@@ -9,13 +10,17 @@ async def test_run_agent_orchestrates_pipeline():
         source="hn", title="Test", url="https://test.com",
         llm_score=8.0, is_recommended=True,
     )
+    async def stream():
+        yield [mock_article]
+
     mock_source = AsyncMock()
-    mock_source.fetch = AsyncMock(return_value=[mock_article])
+    mock_source.stream = stream
     mock_source.name = "test"
 
     mock_storage = AsyncMock()
-    mock_storage.article_exists = AsyncMock(return_value=False)
-    mock_storage.get_previous_score = AsyncMock(return_value=None)
+    mock_storage.get_known_scores = AsyncMock(return_value={})
+    mock_storage.get_host_failures = AsyncMock(return_value={})
+    mock_storage.get_latency_samples = AsyncMock(return_value={})
 
     mock_filter = AsyncMock()
     mock_filter.filter_articles = AsyncMock(return_value=[mock_article])
@@ -46,3 +51,16 @@ async def test_run_agent_orchestrates_pipeline():
     # Verify send was called with two arguments (articles, papers)
     assert len(mock_email.send.call_args[0]) == 2
     mock_storage.mark_sent.assert_called_once()
+
+
+async def test_fetch_all_keeps_batches_on_deadline():
+    class SlowSource:
+        name = "slow"
+
+        async def stream(self):
+            yield [Article(source="slow", title="Early", url="https://early.com")]
+            await asyncio.sleep(10)
+            yield [Article(source="slow", title="Late", url="https://late.com")]
+
+    articles = await fetch_all([SlowSource()], deadline=0.05)
+    assert [a.title for a in articles] == ["Early"]
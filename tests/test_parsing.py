@@ -0,0 +1,116 @@
+import pytest
+
+from news_agent.parsing import ParseExecutor, parse_feed, parse_listing, parse_trending
+
+FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><title>Hello</title><link>https://example.com/1</link>
+<description>Body</description><pubDate>Sat, 21 Feb 2026 08:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def test_parse_feed_returns_plain_tuples():
+    [(title, link, summary, author, published)] = parse_feed(FEED)
+    assert (title, link, summary, author) == ("Hello", "https://example.com/1", "Body", "")
+    assert isinstance(published, float)
+
+
+def test_parse_trending():
+    html = (
+        b'<article class="Box-row"><h2><a href="/user/repo">x</a></h2>'
+        b"<p>Desc</p><a href=\"/user/repo/stargazers\">1,234</a>"
+        b'<span itemprop="programmingLanguage">Rust</span></article>'
+    )
+    assert parse_trending(html) == [("user/repo", "Desc", 1234, "Rust")]
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_executor_runs_parsers(kind):
+    executor = ParseExecutor({"executor": kind, "max_workers": 1})
+    try:
+        entries = await executor.run(parse_feed, FEED, "utf-8")
+    finally:
+        executor.close()
+    assert entries[0][0] == "Hello"
+
+
+def test_unknown_executor_rejected():
+    with pytest.raises(ValueError):
+        ParseExecutor({"executor": "fiber"})
+
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title>
+<entry><title>New</title><link rel="alternate" href="https://example.com/new"/>
+<author><name>Ann</name></author><summary>Fresh</summary>
+<published>2026-02-21T08:00:00Z</published></entry>
+<entry><title>Old</title><link href="https://example.com/old"/>
+<updated>2020-01-01T00:00:00Z</updated></entry>
+</feed>"""
+
+
+def test_streaming_atom_stops_at_cutoff():
+    entries = parse_feed(ATOM_FEED)
+    assert [e[:4] for e in entries] == [
+        ("New", "https://example.com/new", "Fresh", "Ann"),
+        ("Old", "https://example.com/old", "", ""),
+    ]
+    cutoff = entries[1][4] + 1
+    assert [e[0] for e in parse_feed(ATOM_FEED, cutoff=cutoff)] == ["New"]
+
+
+def test_streaming_matches_feedparser_timestamps():
+    from news_agent.parsing import _parse_feed_feedparser
+
+    assert parse_feed(FEED) == _parse_feed_feedparser(FEED, "utf-8")
+
+
+def test_malformed_feed_falls_back_to_feedparser():
+    broken = FEED.replace(b"</channel>", b"&nbsp;</channel>")
+    assert [e[0] for e in parse_feed(broken)] == ["Hello"]
+
+
+LINK_FALLBACK_RSS = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><title>Guid only</title><guid>https://example.com/guid</guid></item>
+<item><title>Opaque guid</title><guid isPermaLink="false">tag:example.com,1</guid></item>
+<item><title>Linked</title><link>https://example.com/linked</link></item>
+</channel></rss>"""
+
+LINK_FALLBACK_ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title>
+<entry><title type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml">Rich <b>title</b></div></title>
+<link rel="related" href="https://example.com/related"/>
+<content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Rich body</p></div></content></entry>
+<entry><title>No link</title></entry>
+</feed>"""
+
+
+def test_streaming_rss_falls_back_to_permalink_guid():
+    entries = parse_feed(LINK_FALLBACK_RSS)
+    assert [e[:2] for e in entries] == [
+        ("Guid only", "https://example.com/guid"),
+        ("Linked", "https://example.com/linked"),
+    ]
+
+
+def test_streaming_atom_first_link_and_xhtml_text():
+    [(title, link, summary, _, _)] = parse_feed(LINK_FALLBACK_ATOM)
+    assert (title, link, summary) == ("Rich title", "https://example.com/related", "Rich body")
+
+
+def test_in_document_encoding_detected_without_http_charset():
+    latin1_feed = (
+        '<?xml version="1.0" encoding="iso-8859-1"?><rss version="2.0"><channel>'
+        "<title>F</title><item><title>Caf\u00e9 &nbsp;</title>"
+        "<link>https://example.com/cafe</link></item></channel></rss>"
+    ).encode("iso-8859-1")
+    # &nbsp; is not XML, so this goes through the feedparser fallback.
+    assert parse_feed(latin1_feed)[0][0].startswith("Caf\u00e9")
+
+    gbk_page = (
+        '<html><head><meta charset="gbk"></head><body>'
+        '<li><a href="/n/1">\u65b0\u95fb\u6807\u9898</a></li></body></html>'
+    ).encode("gbk")
+    items = parse_listing(gbk_page, None, "https://example.cn/", {"item": "li", "title": "a"})
+    assert items == [("\u65b0\u95fb\u6807\u9898", "https://example.cn/n/1", 0, "")]
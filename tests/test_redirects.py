@@ -0,0 +1,43 @@
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from news_agent.http_client import HttpClient
+from news_agent.models import Article
+from news_agent.redirects import RedirectResolver
+
+
+async def test_short_links_resolved_once_across_runs(storage):
+    hits = []
+
+    async def short(request):
+        hits.append(request.method)
+        raise web.HTTPFound("/story")
+
+    async def story(request):
+        return web.Response(text="story")
+
+    app = web.Application()
+    app.router.add_get("/s/1", short)
+    app.router.add_get("/story", story)
+    server = TestServer(app)
+    await server.start_server()
+    short_url = str(server.make_url("/s/1"))
+    config = {"hosts": [server.host]}
+    try:
+        for _ in range(2):
+            articles = [
+                Article(source="x_com", title="A", url=short_url),
+                Article(source="rss", title="B", url=short_url),
+                Article(source="rss", title="C", url="https://example.com/direct"),
+            ]
+            async with HttpClient() as http:
+                resolver = RedirectResolver(config, http=http, storage=storage)
+                await resolver.resolve_articles(articles)
+            assert [a.url for a in articles] == [
+                str(server.make_url("/story")),
+                str(server.make_url("/story")),
+                "https://example.com/direct",
+            ]
+    finally:
+        await server.close()
+    assert hits == ["HEAD"]
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from news_agent.http_client import HttpClient
+from news_agent.scheduler import CircuitOpenError
+
+
+async def _serve(handler) -> TestServer:
+    app = web.Application()
+    app.router.add_get("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+async def test_retries_honour_retry_after():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.Response(text="ok")
+
+    server = await _serve(handler)
+    try:
+        async with HttpClient({"backoff_base": 0}) as http:
+            async with http.get(str(server.make_url("/"))) as resp:
+                assert resp.status == 200
+    finally:
+        await server.close()
+    assert len(calls) == 3
+
+
+async def test_per_host_concurrency_cap():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return web.Response(text="ok")
+
+    server = await _serve(handler)
+
+    async def get(http):
+        async with http.get(str(server.make_url("/"))) as resp:
+            await resp.read()
+
+    try:
+        async with HttpClient({"host_limits": {server.host: 2}}) as http:
+            await asyncio.gather(*(get(http) for _ in range(6)))
+    finally:
+        await server.close()
+    assert peak == 2
+
+
+async def test_failing_host_gets_probe_then_opens(storage):
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.Response(text="late")
+
+    server = await _serve(handler)
+    await storage.save_host_outcomes(set(), {server.host})
+    await storage.save_host_outcomes(set(), {server.host})
+    try:
+        async with HttpClient(
+            {"breaker_threshold": 2, "probe_timeout": 0.05}, storage=storage
+        ) as http:
+            with pytest.raises(CircuitOpenError):
+                async with http.get(str(server.make_url("/"))):
+                    pass
+            with pytest.raises(CircuitOpenError, match="circuit open"):
+                async with http.get(str(server.make_url("/"))):
+                    pass
+    finally:
+        await server.close()
+    assert (await storage.get_host_failures())[server.host] == 3
+
+
+async def test_success_resets_failures(storage):
+    async def handler(request):
+        return web.Response(text="ok")
+
+    server = await _serve(handler)
+    await storage.save_host_outcomes(set(), {server.host})
+    try:
+        async with HttpClient(storage=storage) as http:
+            async with http.get(str(server.make_url("/"))) as resp:
+                assert resp.status == 200
+    finally:
+        await server.close()
+    assert server.host not in await storage.get_host_failures()
+
+
+async def test_cancelled_request_not_counted_as_failure():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.Response(text="ok")
+
+    server = await _serve(handler)
+    try:
+        async with HttpClient() as http:
+            with pytest.raises(TimeoutError):
+                async with asyncio.timeout(0.05):
+                    async with http.get(str(server.make_url("/"))):
+                        pass
+            assert server.host not in http.scheduler.failed
+    finally:
+        await server.close()
@@ -1,3 +1,4 @@
+import asyncio
 import re
 
 from aioresponses import aioresponses
@@ -154,3 +155,112 @@ async def test_source_metadata():
     assert articles[0].source == "arxiv_papers"
     assert "arxiv" in articles[0].tags
     assert articles[0].url == "https://arxiv.org/abs/2401.00001"
+
+
+def test_extract_arxiv_id():
+    extract = ArxivPapersSource._extract_arxiv_id
+    assert extract("https://arxiv.org/abs/2401.12345v2") == "2401.12345"
+    assert extract("https://arxiv.org/pdf/2401.12345.pdf") == "2401.12345"
+    assert extract("https://example.com/paper") == ""
+    assert extract("https://arxiv.org/abs/hep-th/9901001v3") == "hep-th/9901001"
+    assert extract("http://arxiv.org/pdf/math.GT/0309136.pdf") == "math.GT/0309136"
+
+
+async def test_cached_hf_metadata_used_when_only_pwc_lists_paper(storage):
+    with aioresponses() as mocked:
+        mocked.get(HF_PATTERN, payload=[_hf_paper("2401.00001", "HF Title", upvotes=42)])
+        mocked.get(PWC_PATTERN, payload={"count": 0, "results": []})
+        await ArxivPapersSource(storage=storage).fetch()
+
+    with aioresponses() as mocked:
+        mocked.get(HF_PATTERN, payload=[])
+        mocked.get(
+            PWC_PATTERN,
+            payload={"count": 1, "results": [_pwc_paper("2401.00001", "PWC Title")]},
+        )
+        articles = await ArxivPapersSource(storage=storage).fetch()
+
+    assert len(articles) == 1
+    assert articles[0].title == "HF Title"
+    assert articles[0].score == 42
+    cached = await storage.get_papers(["2401.00001"])
+    assert cached["2401.00001"]["field_sources"]["title"] == "huggingface"
+
+
+async def test_pwc_paper_with_cached_upvotes_ranked_globally(storage):
+    with aioresponses() as mocked:
+        mocked.get(HF_PATTERN, payload=[_hf_paper("2401.00009", "Popular", upvotes=90)])
+        mocked.get(PWC_PATTERN, payload={"count": 0, "results": []})
+        await ArxivPapersSource(storage=storage).fetch()
+
+    with aioresponses() as mocked:
+        mocked.get(
+            HF_PATTERN,
+            payload=[_hf_paper(f"2401.0000{i}", f"HF {i}", upvotes=i) for i in (1, 2)],
+        )
+        mocked.get(
+            PWC_PATTERN,
+            payload={"count": 1, "results": [_pwc_paper("2401.00009", "PWC Title")]},
+        )
+        articles = await ArxivPapersSource({"max_papers": 2}, storage=storage).fetch()
+
+    # Each upstream yields its own top papers; run_agent ranks them all.
+    ranked = sorted(articles, key=lambda a: a.score, reverse=True)
+    assert [a.title for a in ranked[:2]] == ["Popular", "HF 2"]
+
+
+async def test_stale_cached_upvotes_not_used_as_score(storage):
+    await storage.save_papers(
+        [
+            {
+                "arxiv_id": "2401.00001",
+                "title": "HF Title",
+                "abstract": "",
+                "upvotes": [["2020-01-01T00:00:00+00:00", 500]],
+                "field_sources": {"title": "huggingface"},
+            }
+        ]
+    )
+    with aioresponses() as mocked:
+        mocked.get(HF_PATTERN, payload=[])
+        mocked.get(
+            PWC_PATTERN,
+            payload={"count": 1, "results": [_pwc_paper("2401.00001", "PWC Title")]},
+        )
+        [article] = await ArxivPapersSource(storage=storage).fetch()
+    assert (article.title, article.score) == ("HF Title", 0)
+
+
+async def test_hf_papers_kept_when_pwc_hangs():
+    source = ArxivPapersSource()
+    source.timeout = 0.2
+
+    async def hang(url, **kwargs):
+        await asyncio.sleep(5)
+
+    with aioresponses() as mocked:
+        mocked.get(HF_PATTERN, payload=[_hf_paper("2401.00001", "HF Paper", upvotes=3)])
+        mocked.get(PWC_PATTERN, callback=hang)
+        articles = await source.fetch()
+
+    assert [a.title for a in articles] == ["HF Paper"]
+
+
+async def test_hf_fields_win_when_pwc_answers_first():
+    async def slow_hf(url, **kwargs):
+        await asyncio.sleep(0.05)
+
+    source = ArxivPapersSource()
+    with aioresponses() as mocked:
+        mocked.get(
+            HF_PATTERN,
+            callback=slow_hf,
+            payload=[_hf_paper("2401.00002", "HF Title", upvotes=8)],
+        )
+        mocked.get(
+            PWC_PATTERN,
+            payload={"count": 1, "results": [_pwc_paper("2401.00002", "PWC Title")]},
+        )
+        articles = await source.fetch()
+
+    assert [(a.title, a.score) for a in articles] == [("HF Title", 8)]
@@ -0,0 +1,22 @@
+import pytest
+
+from news_agent.models import Article
+from news_agent.sources.base import BaseSource
+
+
+def test_source_without_stream_cannot_be_instantiated():
+    class Incomplete(BaseSource):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_one_shot_fetch_is_adapted_to_a_stream():
+    class OneShot(BaseSource):
+        name = "one_shot"
+
+        async def _fetch(self, http):
+            return [Article(source=self.name, title="Only", url="https://example.com")]
+
+    assert [[a.title for a in batch] async for batch in OneShot().stream()] == [["Only"]]
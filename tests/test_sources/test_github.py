@@ -23,3 +23,29 @@ async def test_github_trending_fetch():
     assert len(articles) >= 1
     assert articles[0].source == "github"
     assert "repo" in articles[0].title
+
+
+def _row(repo_path: str, stars: int) -> str:
+    return (
+        f'<article class="Box-row"><h2><a href="/{repo_path}">{repo_path}</a></h2>'
+        f'<a href="/{repo_path}/stargazers">{stars}</a></article>'
+    )
+
+
+async def test_since_ranges_and_languages_deduplicated():
+    source = GitHubTrendingSource({"since": ["daily", "weekly"], "languages": ["", "rust"]})
+    pages = {
+        "https://github.com/trending?since=daily": _row("a/one", 10),
+        "https://github.com/trending?since=weekly": _row("a/one", 10) + _row("b/two", 5),
+        "https://github.com/trending/rust?since=daily": _row("c/three", 3),
+        "https://github.com/trending/rust?since=weekly": _row("b/two", 5),
+    }
+    with aioresponses() as mocked:
+        for url, html in pages.items():
+            mocked.get(url, body=f"<html><nav>menu</nav>{html}</html>")
+        articles = await source.fetch()
+    assert [a.url for a in articles] == [
+        "https://github.com/a/one",
+        "https://github.com/b/two",
+        "https://github.com/c/three",
+    ]
@@ -1,3 +1,6 @@
+import re
+from urllib.parse import unquote
+
 from aioresponses import aioresponses
 
 from news_agent.sources.hackernews import HackerNewsSource
@@ -41,3 +44,67 @@ async def test_hackernews_fetch():
     assert articles[0].source == "hackernews"
     assert articles[0].title == "Show HN: Cool Project"
     assert articles[0].score == 150
+
+
+async def test_hackernews_bulk_mode_single_list_request():
+    source = HackerNewsSource(
+        {"max_items": 3, "mode": "bulk", "bulk_url": "http://hn.local/search"}
+    )
+    with aioresponses() as mocked:
+        mocked.get(
+            "https://hacker-news.firebaseio.com/v0/topstories.json",
+            payload=[201, 202, 203],
+        )
+        mocked.get(
+            re.compile(r"^http://hn\.local/search\?"),
+            payload={
+                "hits": [
+                    {"objectID": "202", "title": "Second", "url": None,
+                     "author": "b", "points": 20, "num_comments": 2,
+                     "created_at_i": 1708500000},
+                    {"objectID": "201", "title": "First", "url": "https://first.com",
+                     "author": "a", "points": 10, "num_comments": 1,
+                     "created_at_i": 1708500000},
+                ]
+            },
+        )
+        # Not indexed by Algolia yet: fetched from Firebase.
+        mocked.get(
+            "https://hacker-news.firebaseio.com/v0/item/203.json",
+            payload={"id": 203, "title": "Third", "by": "c", "score": 1, "time": 1708500000},
+        )
+        articles = await source.fetch()
+        bulk_calls = [k for k in mocked.requests if k[1].host == "hn.local"]
+    assert len(bulk_calls) == 1
+    assert unquote(bulk_calls[0][1].query["tags"]) == "(story_201,story_202,story_203)"
+    assert [a.title for a in articles] == ["First", "Second", "Third"]
+    assert articles[1].url == "https://news.ycombinator.com/item?id=202"
+    assert articles[1].score == 20
+
+
+async def test_hackernews_item_cache_refreshes_scores(storage):
+    item = {"id": 301, "title": "Cached", "url": "https://cached.com",
+            "by": "c", "score": 5, "descendants": 1, "time": 1708500000}
+    for points in (5, 50):
+        source = HackerNewsSource(
+            {"max_items": 1, "bulk_url": "http://hn.local/search"}, storage=storage
+        )
+        with aioresponses() as mocked:
+            mocked.get(
+                "https://hacker-news.firebaseio.com/v0/topstories.json",
+                payload=[301],
+            )
+            mocked.get(
+                "https://hacker-news.firebaseio.com/v0/item/301.json",
+                payload=item,
+            )
+            mocked.get(
+                re.compile(r"^http://hn\.local/search\?"),
+                payload={"hits": [{"objectID": "301", "points": points, "num_comments": 9}]},
+            )
+            articles = await source.fetch()
+            item_calls = [k for k in mocked.requests if "item" in k[1].path]
+        assert [a.title for a in articles] == ["Cached"]
+        assert articles[0].score == points
+    assert item_calls == []
+    assert articles[0].comments_count == 9
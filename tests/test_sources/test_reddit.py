@@ -45,3 +45,43 @@ async def test_reddit_fetch():
     assert len(articles) == 1
     assert articles[0].source == "reddit"
     assert articles[0].title == "New AI Breakthrough"
+
+
+def _listing(posts, after=None):
+    return {
+        "data": {
+            "after": after,
+            "children": [
+                {"data": {"title": t, "url": f"https://{t}.com", "subreddit": s}}
+                for t, s in posts
+            ],
+        }
+    }
+
+
+async def test_reddit_multireddit_pagination_and_token_not_persisted(storage):
+    config = {
+        "subreddits": ["technology", "programming"],
+        "multireddit": True,
+        "pages": 2,
+        "limit": 2,
+    }
+    base = "https://oauth.reddit.com/r/technology+programming/hot?limit=2"
+    for _ in range(2):
+        source = RedditSource(config, storage=storage)
+        with aioresponses() as mocked:
+            mocked.post(
+                "https://www.reddit.com/api/v1/access_token",
+                payload={"access_token": "tok", "expires_in": 86400},
+            )
+            mocked.get(
+                base,
+                payload=_listing([("a", "technology"), ("b", "programming")], "t3_b"),
+            )
+            mocked.get(f"{base}&after=t3_b", payload=_listing([("c", "technology")]))
+            articles = await source.fetch()
+            token_calls = [k for k in mocked.requests if k[0] == "POST"]
+        assert [a.title for a in articles] == ["a", "b", "c"]
+        assert articles[1].tags == ["programming"]
+        assert len(token_calls) == 1
+    assert await storage.get_state("reddit", "oauth_token") is None
@@ -1,23 +1,210 @@
+import asyncio
 from unittest.mock import MagicMock, patch
 
-from news_agent.sources.rss import RssSource
+from aioresponses import aioresponses
+
+from news_agent.http_client import HttpClient
+from news_agent.sources.rss import PollState, RssSource
+
+FEED_XML = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><title>{title}</title><link>{link}</link></item>
+</channel></rss>"""
 
 
 async def test_rss_fetch():
     source = RssSource({"feeds": ["https://example.com/feed.xml"]})
     mock_feed = MagicMock()
+    entry = {
+        "title": "RSS Article",
+        "link": "https://example.com/article1",
+        "summary": "A summary",
+        "author": "Author",
+    }
     mock_feed.entries = [
         MagicMock(
-            title="RSS Article",
-            link="https://example.com/article1",
-            get=lambda k, d="": {"summary": "A summary", "author": "Author"}.get(
-                k, d
-            ),
+            get=lambda k, d="": entry.get(k, d),
             published_parsed=(2026, 2, 21, 8, 0, 0, 0, 0, 0),
         )
     ]
-    with patch("news_agent.sources.rss.feedparser.parse", return_value=mock_feed):
+    with aioresponses() as mocked, patch(
+        "news_agent.parsing.feedparser.parse", return_value=mock_feed
+    ):
+        mocked.get("https://example.com/feed.xml", body="<rss/>")
         articles = await source.fetch()
     assert len(articles) == 1
     assert articles[0].source == "rss"
     assert articles[0].title == "RSS Article"
+
+
+async def test_rss_per_feed_outcomes():
+    source = RssSource(
+        {
+            "feeds": [
+                "https://ok.example/feed",
+                "https://slow.example/feed",
+                "https://broken.example/feed",
+            ],
+            "feed_timeout": 0.1,
+        }
+    )
+
+    async def slow_callback(url, **kwargs):
+        await asyncio.sleep(1)
+
+    with aioresponses() as mocked:
+        mocked.get(
+            "https://ok.example/feed",
+            body=FEED_XML.format(title="Fast", link="https://ok.example/1"),
+        )
+        mocked.get("https://slow.example/feed", callback=slow_callback)
+        mocked.get("https://broken.example/feed", exception=ConnectionError("boom"))
+        articles = await source.fetch()
+
+    assert [a.title for a in articles] == ["Fast"]
+    outcomes = {r.url: r for r in source.feed_results}
+    assert outcomes["https://ok.example/feed"].status == "ok"
+    assert outcomes["https://ok.example/feed"].bytes > 0
+    assert outcomes["https://slow.example/feed"].status == "timeout"
+    assert outcomes["https://broken.example/feed"].status == "error"
+    assert "boom" in outcomes["https://broken.example/feed"].error
+
+
+async def test_rss_keeps_finished_feeds_on_source_timeout():
+    source = RssSource(
+        {"feeds": ["https://ok.example/feed", "https://slow.example/feed"]}
+    )
+    source.timeout = 0.2
+
+    async def slow_callback(url, **kwargs):
+        await asyncio.sleep(5)
+
+    with aioresponses() as mocked:
+        mocked.get(
+            "https://ok.example/feed",
+            body=FEED_XML.format(title="Fast", link="https://ok.example/1"),
+        )
+        mocked.get("https://slow.example/feed", callback=slow_callback)
+        articles = await source.fetch()
+
+    assert [a.title for a in articles] == ["Fast"]
+
+
+def _dated_feed(*items: tuple[int, int]) -> str:
+    entries = "".join(
+        f"<item><title>Post {n}</title><link>https://blog.example/{n}</link>"
+        f"<pubDate>{day:02d} Feb 2026 08:00:00 GMT</pubDate></item>"
+        for n, day in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>B</title>{entries}</channel></rss>'
+
+
+async def test_rss_high_water_mark_skips_seen_entries(storage):
+    feed_url = "https://blog.example/feed"
+    with aioresponses() as mocked:
+        mocked.get(feed_url, body=_dated_feed((2, 20), (1, 19)))
+        first = await RssSource({"feeds": [feed_url]}, storage=storage).fetch()
+    await storage.commit_staged_state()
+
+    with aioresponses() as mocked:
+        mocked.get(feed_url, body=_dated_feed((3, 21), (2, 20), (1, 19)))
+        second = await RssSource({"feeds": [feed_url]}, storage=storage).fetch()
+
+    assert [a.title for a in first] == ["Post 2", "Post 1"]
+    assert [a.title for a in second] == ["Post 3"]
+
+
+async def test_rss_marks_not_persisted_until_committed(storage):
+    feed_url = "https://blog.example/feed"
+    for _ in range(2):
+        with aioresponses() as mocked:
+            mocked.get(feed_url, body=_dated_feed((1, 19)))
+            articles = await RssSource({"feeds": [feed_url]}, storage=storage).fetch()
+        assert [a.title for a in articles] == ["Post 1"]
+
+
+async def test_rss_validator_not_committed_when_parse_fails(storage):
+    feed_url = "https://blog.example/feed"
+
+    async def run(parse_error: bool):
+        with aioresponses() as mocked:
+            mocked.get(feed_url, body=_dated_feed((1, 19)), headers={"ETag": '"v1"'})
+            async with HttpClient(storage=storage) as http:
+                source = RssSource({"feeds": [feed_url]}, http=http, storage=storage)
+                if parse_error:
+                    with patch(
+                        "news_agent.sources.rss.parse_feed", side_effect=ValueError("bad")
+                    ):
+                        articles = await source.fetch()
+                else:
+                    articles = await source.fetch()
+                await http.commit_validators()
+        await storage.commit_staged_state()
+        return articles, source.feed_results[0].status
+
+    assert await run(parse_error=True) == ([], "error")
+    articles, status = await run(parse_error=False)
+    assert (status, [a.title for a in articles]) == ("ok", ["Post 1"])
+    assert (await run(parse_error=False))[1] == "not_modified"
+
+
+def test_opml_feeds_merged_with_config(tmp_path):
+    opml = tmp_path / "subs.opml"
+    opml.write_text(
+        '<?xml version="1.0"?><opml version="2.0"><body>'
+        '<outline text="Tech"><outline type="rss" xmlUrl="https://a.example/feed"/>'
+        '<outline type="rss" xmlUrl="https://b.example/feed"/></outline>'
+        "</body></opml>"
+    )
+    source = RssSource({"feeds": ["https://a.example/feed"], "opml": str(opml)})
+    assert source.feeds == ["https://a.example/feed", "https://b.example/feed"]
+
+
+def test_poll_interval_follows_publishing_rate():
+    poll = PollState()
+    hour = 3600
+    poll.update(0, [10 * hour, 8 * hour, 6 * hour], min_interval=60, max_interval=86400)
+    assert poll.interval == hour
+    assert not poll.is_due(hour - 1) and poll.is_due(hour)
+    poll.update(hour, [], min_interval=60, max_interval=86400)
+    assert poll.interval == 1.5 * hour
+
+
+async def test_adaptive_polling_skips_feeds_not_due(storage):
+    config = {"feeds": ["https://blog.example/feed"], "adaptive_polling": True}
+    with aioresponses() as mocked:
+        mocked.get("https://blog.example/feed", body=_dated_feed((2, 20), (1, 10)))
+        await RssSource(config, storage=storage).fetch()
+    await storage.commit_staged_state()
+
+    source = RssSource(config, storage=storage)
+    with aioresponses() as mocked:
+        assert await source.fetch() == []
+        assert not mocked.requests
+
+
+async def test_rss_pinned_seen_entry_does_not_hide_new_ones(storage):
+    feed_url = "https://blog.example/feed"
+    with aioresponses() as mocked:
+        mocked.get(feed_url, body=_dated_feed((1, 10)))
+        await RssSource({"feeds": [feed_url]}, storage=storage).fetch()
+    await storage.commit_staged_state()
+
+    # Post 1 is pinned above newer posts; Post 2 predates the newest seen.
+    with aioresponses() as mocked:
+        mocked.get(feed_url, body=_dated_feed((1, 10), (3, 21), (2, 5)))
+        articles = await RssSource({"feeds": [feed_url]}, storage=storage).fetch()
+
+    assert [a.title for a in articles] == ["Post 3", "Post 2"]
+
+
+def test_unreadable_opml_skipped(tmp_path):
+    broken = tmp_path / "broken.opml"
+    broken.write_text("<opml><body><outline")
+    source = RssSource(
+        {
+            "feeds": ["https://a.example/feed"],
+            "opml": [str(tmp_path / "missing.opml"), str(broken)],
+        }
+    )
+    assert source.feeds == ["https://a.example/feed"]
@@ -0,0 +1,55 @@
+from aioresponses import aioresponses
+
+from news_agent.sources.scrape import ScrapeSource
+
+SITE = {
+    "name": "forum",
+    "url": "https://forum.example.com/list-{page}.html",
+    "pages": 3,
+    "item": "tr.thread",
+    "title": "a.title",
+    "score": "td.replies",
+    "date": "td.date@title",
+    "date_format": "%Y-%m-%d",
+}
+
+
+def _page(*threads: int) -> str:
+    rows = "".join(
+        f'<tr class="thread"><td><a class="title" href="/t/{n}">Thread {n}</a></td>'
+        f'<td class="replies">1,20{n}</td><td class="date" title="2026-02-0{n % 9 + 1}">x</td></tr>'
+        for n in threads
+    )
+    return f"<html><table>{rows}</table></html>"
+
+
+async def test_scrape_site_with_selectors():
+    source = ScrapeSource({"sites": [SITE]})
+    with aioresponses() as mocked:
+        mocked.get("https://forum.example.com/list-1.html", body=_page(1, 2))
+        mocked.get("https://forum.example.com/list-2.html", body=_page(3))
+        mocked.get("https://forum.example.com/list-3.html", body=_page(4))
+        articles = await source.fetch()
+    assert [a.url for a in articles] == [
+        f"https://forum.example.com/t/{n}" for n in (1, 2, 3, 4)
+    ]
+    assert articles[0].title == "Thread 1"
+    assert articles[0].score == 1201
+    assert articles[0].published_at.day == 2
+    assert articles[0].tags == ["forum"]
+
+
+async def test_paging_stops_at_seen_items(storage):
+    await storage.set_state("scrape", "seen:forum", ["https://forum.example.com/t/2"])
+    source = ScrapeSource({"sites": [SITE], "concurrency": 1}, storage=storage)
+    with aioresponses() as mocked:
+        mocked.get("https://forum.example.com/list-1.html", body=_page(5, 2))
+        articles = await source.fetch()
+        assert len(mocked.requests) == 1
+    assert [a.title for a in articles] == ["Thread 5", "Thread 2"]
+    assert await storage.get_state("scrape", "seen:forum") == [
+        "https://forum.example.com/t/2"
+    ]
+    await storage.commit_staged_state()
+    seen = await storage.get_state("scrape", "seen:forum")
+    assert seen[0] == "https://forum.example.com/t/5"
@@ -0,0 +1,89 @@
+from news_agent.sources.twitter import XSource
+
+
+def _tweet(**overrides):
+    tweet = {
+        "text": "Shipping a new release today",
+        "author": "Alice",
+        "status_url": "https://x.com/alice/status/1",
+        "link": "",
+        "like": "1.2K",
+        "retweet": "30",
+        "reply": "4",
+    }
+    tweet.update(overrides)
+    return tweet
+
+
+def test_to_article_from_extracted_tweet():
+    article = XSource()._to_article(_tweet())
+    assert article.url == "https://x.com/alice/status/1"
+    assert article.author == "Alice"
+    assert article.score == 1230
+    assert article.comments_count == 4
+
+
+def test_external_link_preferred_over_status_url():
+    article = XSource()._to_article(_tweet(link="https://example.com/post", like=""))
+    assert article.url == "https://example.com/post"
+    assert article.score == 30
+
+
+async def test_heavy_resources_blocked():
+    class FakeRoute:
+        def __init__(self, resource_type):
+            self.request = type("Request", (), {"resource_type": resource_type})()
+            self.action = None
+
+        async def abort(self):
+            self.action = "abort"
+
+        async def continue_(self):
+            self.action = "continue"
+
+    routes = [FakeRoute(t) for t in ("image", "font", "xhr", "document")]
+    for route in routes:
+        await XSource._block_heavy_resources(route)
+    assert [r.action for r in routes] == ["abort", "abort", "continue", "continue"]
+
+
+def _fake_page(screens):
+    class FakePage:
+        async def evaluate(self, script):
+            if "querySelectorAll" in script:
+                return screens.pop(0)
+
+        async def wait_for_function(self, script, arg, timeout):
+            pass
+
+    return FakePage()
+
+
+async def test_scrolls_until_last_seen_tweet():
+    screens = [
+        [_tweet(status_url=f"https://x.com/a/status/{i}") for i in (9, 8)],
+        [_tweet(status_url=f"https://x.com/a/status/{i}") for i in (8, 7, 6, 5)],
+        [_tweet(status_url=f"https://x.com/a/status/{i}") for i in (4, 3)],
+    ]
+
+    source = XSource({"max_tweets": 2})
+    tweets = await source._collect_tweets(_fake_page(screens), last_seen="6")
+    assert [source._tweet_id(t) for t in tweets] == ["9", "8", "7"]
+
+
+async def test_catch_up_scroll_is_capped():
+    screens = [
+        [_tweet(status_url=f"https://x.com/a/status/{i}") for i in range(20, 10, -1)],
+        [_tweet(status_url=f"https://x.com/a/status/{i}") for i in range(10, 0, -1)],
+    ]
+    source = XSource({"max_tweets": 2, "max_new_tweets": 5})
+    tweets = await source._collect_tweets(_fake_page(screens), last_seen="1")
+    assert [source._tweet_id(t) for t in tweets] == ["20", "19", "18", "17", "16"]
+    assert len(screens) == 1
+
+
+async def test_last_seen_id_is_staged_not_written(storage):
+    XSource(storage=storage)._finish([_tweet(status_url="https://x.com/a/status/42")])
+    assert await storage.get_state("x_com", "last_seen_id") is None
+    await storage.commit_staged_state()
+    assert await storage.get_state("x_com", "last_seen_id") == "42"
@@ -1,3 +1,5 @@
+import time
+
 from aioresponses import aioresponses
 
 from news_agent.sources.v2ex import V2exSource
@@ -24,3 +26,56 @@ async def test_v2ex_fetch():
     assert len(articles) == 1
     assert articles[0].source == "v2ex"
     assert articles[0].title == "Python最佳实践"
+
+
+async def test_v2ex_defers_nodes_beyond_quota(storage):
+    nodes = ["a", "b", "c"]
+    url = "https://www.v2ex.com/api/v2/nodes/{}/topics?p=1"
+    await storage.set_state(
+        "v2ex", "quota", {"remaining": 12, "reset": time.time() + 3600}
+    )
+    source = V2exSource({"nodes": nodes, "reserve": 10, "concurrency": 1}, storage=storage)
+    with aioresponses() as mocked:
+        for node in nodes:
+            mocked.get(
+                url.format(node),
+                payload=[{"id": 1, "title": node, "created": 0}],
+                headers={"X-Rate-Limit-Remaining": "11"},
+            )
+        articles = await source.fetch()
+    assert sorted(a.title for a in articles) == ["a", "b"]
+    assert await storage.get_state("v2ex", "deferred") == ["c"]
+    assert (await storage.get_state("v2ex", "quota"))["remaining"] == 11
+
+    await storage.set_state("v2ex", "quota", {"remaining": None, "reset": 0})
+    source = V2exSource({"nodes": nodes}, storage=storage)
+    assert await source._plan_nodes() == ["c", "a", "b"]
+
+
+async def test_v2ex_defers_failed_nodes_without_retrying(storage):
+    url = "https://www.v2ex.com/api/v2/nodes/{}/topics?p=1"
+    source = V2exSource({"nodes": ["ok", "broken"]}, storage=storage)
+    with aioresponses() as mocked:
+        mocked.get(url.format("ok"), payload=[{"id": 1, "title": "ok", "created": 0}])
+        mocked.get(url.format("broken"), status=503)
+        mocked.get(url.format("broken"), status=200, payload=[])
+        articles = await source.fetch()
+        broken_calls = [k for k in mocked.requests if "broken" in k[1].path]
+    assert [a.title for a in articles] == ["ok"]
+    assert len(mocked.requests[broken_calls[0]]) == 1
+    assert await storage.get_state("v2ex", "deferred") == ["broken"]
+
+
+async def test_v2ex_error_body_skips_only_that_node():
+    url = "https://www.v2ex.com/api/v2/nodes/{}/topics?p=1"
+    source = V2exSource({"nodes": ["bad", "denied", "ok"]})
+    with aioresponses() as mocked:
+        mocked.get(url.format("bad"), payload={"success": False, "message": "Invalid node"})
+        mocked.get(url.format("denied"), status=401, payload={"success": False})
+        mocked.get(
+            url.format("ok"),
+            payload={"success": True, "result": [{"id": 1, "title": "ok", "created": 0}]},
+        )
+        articles = await source.fetch()
+    assert [a.title for a in articles] == ["ok"]
+    assert sorted(source._deferred) == ["bad", "denied"]
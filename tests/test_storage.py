@@ -1,17 +1,7 @@
-import pytest
 from news_agent.storage import Storage
 from news_agent.models import Article
 
 
-@pytest.fixture
-async def storage(tmp_path):
-    db_path = tmp_path / "test.db"
-    s = Storage(str(db_path))
-    await s.initialize()
-    yield s
-    await s.close()
-
-
 async def test_save_and_exists(storage):
     article = Article(source="hackernews", title="Test", url="https://example.com")
     await storage.save_article(article)
@@ -45,3 +35,105 @@ async def test_get_previous_score(storage):
     await storage.save_article(a)
     prev = await storage.get_previous_score(a.url)
     assert prev == 10
+
+
+async def test_save_and_get_validator(storage):
+    assert await storage.get_validator("https://feed.example") is None
+    await storage.save_validators(
+        {"https://feed.example": ('"abc"', "Sat, 21 Feb 2026 08:00:00 GMT", "h1")}
+    )
+    assert await storage.get_validator("https://feed.example") == (
+        '"abc"', "Sat, 21 Feb 2026 08:00:00 GMT", "h1",
+    )
+
+
+async def test_get_known_scores(storage):
+    old = Article(source="hn", title="A1", url="https://a1.com/post", score=10)
+    newer = Article(source="reddit", title="A1", url="http://www.a1.com/post/?utm_source=x", score=25)
+    await storage.save_articles([old, newer])
+    from_feed = Article(source="rss", title="A1", url="https://a1.com/post#comments")
+    fresh = Article(source="hn", title="New", url="https://new.com")
+    assert await storage.get_known_scores([from_feed, fresh]) == {"https://a1.com/post": 25}
+
+
+async def test_save_articles_upserts_in_bulk(storage):
+    articles = [Article(source="rss", title=f"A{i}", url=f"https://a.com/{i}") for i in range(3)]
+    await storage.save_articles(articles)
+    articles[0].score = 42
+    await storage.save_articles(articles[:1])
+    assert await storage.get_previous_score("https://a.com/0") == 42
+    cursor = await storage._db.execute("PRAGMA journal_mode")
+    assert (await cursor.fetchone())[0] == "wal"
+
+
+async def test_canonical_url_backfilled_on_existing_database(tmp_path):
+    import aiosqlite
+
+    path = str(tmp_path / "old.db")
+    async with aiosqlite.connect(path) as db:
+        await db.execute(
+            """CREATE TABLE articles (id TEXT PRIMARY KEY, source TEXT NOT NULL,
+            title TEXT NOT NULL, url TEXT NOT NULL, summary TEXT DEFAULT '',
+            author TEXT DEFAULT '', published_at TEXT, fetched_at TEXT NOT NULL,
+            score INTEGER DEFAULT 0, comments_count INTEGER DEFAULT 0,
+            tags TEXT DEFAULT '[]', llm_score REAL DEFAULT 0.0, llm_reason TEXT DEFAULT '',
+            is_recommended INTEGER DEFAULT 0, is_hot INTEGER DEFAULT 0, sent INTEGER DEFAULT 0)"""
+        )
+        await db.execute(
+            "INSERT INTO articles (id, source, title, url, fetched_at, score) VALUES (?, ?, ?, ?, ?, ?)",
+            ("a", "hn", "T", "http://m.example.com/x/", "2026-01-01T00:00:00+00:00", 7),
+        )
+        await db.commit()
+    storage = Storage(path)
+    await storage.initialize()
+    try:
+        assert await storage.get_previous_score("https://example.com/x") == 7
+    finally:
+        await storage.close()
+
+
+async def test_bloom_filter_tracks_inserts_and_rebuilds_when_stale(tmp_path):
+    path = str(tmp_path / "bloom.db")
+    config = {"bloom": {"enabled": True, "capacity": 100}}
+    storage = Storage(path, config)
+    await storage.initialize()
+    try:
+        await storage.save_article(Article(source="hn", title="A", url="https://a.com/x", score=3))
+        assert await storage.article_exists(Article(source="hn", title="A", url="https://a.com/x").id)
+        known = [Article(source="rss", title="A", url="http://www.a.com/x/")]
+        assert await storage.get_known_scores(known) == {"https://a.com/x": 3}
+    finally:
+        await storage.close()
+
+    # Rows written while the filter was not maintained make it stale.
+    plain = Storage(path)
+    await plain.initialize()
+    await plain.save_article(Article(source="hn", title="B", url="https://b.com/y", score=5))
+    await plain.close()
+
+    storage = Storage(path, config)
+    await storage.initialize()
+    try:
+        assert "https://b.com/y" in storage.bloom
+        fresh = [Article(source="hn", title="B", url="https://b.com/y")]
+        assert await storage.get_known_scores(fresh) == {"https://b.com/y": 5}
+    finally:
+        await storage.close()
+
+
+async def test_truncated_bloom_file_rebuilt(tmp_path):
+    path = str(tmp_path / "bloom.db")
+    config = {"bloom": {"enabled": True, "capacity": 100}}
+    storage = Storage(path, config)
+    await storage.initialize()
+    await storage.save_article(Article(source="hn", title="A", url="https://a.com/x"))
+    await storage.close()
+    with open(f"{path}.bloom", "r+b") as f:
+        f.truncate(20)
+
+    storage = Storage(path, config)
+    await storage.initialize()
+    try:
+        assert "https://a.com/x" in storage.bloom
+    finally:
+        await storage.close()
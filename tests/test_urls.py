@@ -0,0 +1,29 @@
+import pytest
+
+from news_agent.models import Article
+from news_agent.urls import canonicalize
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("http://www.Example.com/post/", "https://example.com/post"),
+        ("https://m.example.com/post?utm_source=hn&utm_medium=x", "https://example.com/post"),
+        ("https://example.com/post?b=2&a=1&fbclid=abc#comments", "https://example.com/post?a=1&b=2"),
+        ("https://example.com:443/", "https://example.com"),
+        ("https://example.com:8080/a", "https://example.com:8080/a"),
+        ("https://arxiv.org/pdf/2401.12345v2.pdf", "https://arxiv.org/abs/2401.12345"),
+        ("http://export.arxiv.org/abs/2401.12345v1", "https://arxiv.org/abs/2401.12345"),
+        ("https://news.ycombinator.com/item?id=1", "https://news.ycombinator.com/item?id=1"),
+        ("mailto:someone@example.com", "mailto:someone@example.com"),
+    ],
+)
+def test_canonicalize(url, expected):
+    assert canonicalize(url) == expected
+
+
+def test_canonical_url_recomputed_after_url_changes():
+    article = Article(source="rss", title="t", url="https://t.co/abc")
+    assert article.canonical_url == "https://t.co/abc"
+    article.url = "https://www.example.com/post?utm_source=x"
+    assert article.canonical_url == "https://example.com/post"